@@ -1,12 +1,21 @@
+import json
+import os
 import sqlite3
+import threading
+import numpy as np
 import pandas as pd
-from dash import Dash, html, dcc, Input, Output, ctx
+from dash import Dash, html, dcc, Input, Output, State, Patch
+from dash.exceptions import PreventUpdate
 import plotly.graph_objects as go
 import plotly.express as px
 import plotly.colors as pc
+import plotly.io as pio
 from plotly.subplots import make_subplots 
-import itertools
 import dash_bootstrap_components as dbc
+from flask_caching import Cache
+
+# Serialize figures with orjson (C encoder with native numpy support)
+pio.json.config.default_engine = 'orjson'
 
 # Define styles at the top of the file
 COLOR_SCHEME = {
@@ -27,6 +36,19 @@ CARD_STYLE = {
     'border': f'1px solid {COLOR_SCHEME["secondary"]}'
 }
 
+# Card variants used in the layout
+METRIC_CARD_STYLE = {**CARD_STYLE, 'flex': '1', 'textAlign': 'center'}
+CHART_CARD_STYLE = {**CARD_STYLE, 'flex': '1'}
+FILTER_CARD_STYLE = {**CARD_STYLE, 'display': 'flex', 'alignItems': 'flex-end', 'gap': '24px'}
+FILTER_PANEL_HIDDEN_STYLE = {**FILTER_CARD_STYLE, 'display': 'none'}
+
+# Chart section building blocks, shared by every tab's layout
+GRAPH_STYLE = {'width': '100%', 'height': '600px'}
+CHART_ROW_STYLE = {'display': 'flex', 'justifyContent': 'center', 'alignItems': 'center', 'width': '100%'}
+CHART_LEFT_STYLE = {"position": "relative", "width": "48%", "display": "inline-block", "marginRight": "2%"}
+CHART_RIGHT_STYLE = {"position": "relative", "width": "48%", "display": "inline-block", "marginLeft": "2%"}
+BUTTON_ROW_STYLE = {'textAlign': 'center', 'marginBottom': '24px'}
+
 TEXT_STYLES = {
     'header': {
         'fontSize': '44px',
@@ -102,17 +124,43 @@ TAB_SELECTED_STYLE = {
     'boxShadow': '2px -2px 4px rgba(0,0,0,0.1)'
 }
 
+# Info icon next to each chart and the tooltip it opens
+INFO_ICON_STYLE = {
+    "fontSize": "20px",
+    "cursor": "pointer",
+    "color": "#007BFF",
+    "position": "relative",
+    "top": "-50px",
+    "left": "10px"
+}
+DEMOGRAPHICS_INFO_ICON_STYLE = {**INFO_ICON_STYLE, "position": "left", "left": "-10px"}
+TOOLTIP_STYLE = {"fontSize": "14px"}
+
+# One long-lived read connection per thread (each gunicorn worker/thread keeps its own)
+_db_local = threading.local()
+
 def get_db_connection():
-    """Create and return a database connection"""
-    db_path = 'CustomerData.db'
-    return sqlite3.connect(db_path)
+    """Return this thread's shared database connection"""
+    conn = getattr(_db_local, 'conn', None)
+    if conn is None:
+        db_path = 'CustomerData.db'
+        # The dashboard only reads the bundled database: open it read-only and
+        # immutable so SQLite skips file locking and journal checks
+        conn = sqlite3.connect(f'file:{db_path}?mode=ro&immutable=1', uri=True)
+        conn.execute("PRAGMA query_only=1")
+        # Keep pages cached in memory across the startup queries
+        conn.execute("PRAGMA cache_size=-65536")
+        conn.execute("PRAGMA temp_store=MEMORY")
+        conn.execute("PRAGMA mmap_size=268435456")
+        _db_local.conn = conn
+    return conn
 
 def load_transaction_data():
     """Load and return base transaction data"""
     conn = get_db_connection()
     base_query = """
     SELECT 
-        td.Transaction_ID,
+        td.Transaction_ID AS Transaction_id,
         td.Student_id,
         td.Order_Date,
         sb.Age AS Customer_Age,
@@ -127,44 +175,74 @@ def load_transaction_data():
     LEFT JOIN course_data cd ON td.Student_id = cd.Student_id
     LEFT JOIN course_type ct ON cd.Course_Type_id = ct.Course_Type_ID
     """
-    df = pd.read_sql_query(base_query, conn)
-    conn.close()
-    df['Order_Date'] = pd.to_datetime(df['Order_Date'])
-    return df
-
-def load_data_BT():
-    """Load data for Business Trends"""
-    df = load_transaction_data()
-    df['Day_of_Week'] = df['Order_Date'].dt.day_name()
-    df['Month'] = df['Order_Date'].dt.month_name()
+    # Order_Date is stored as 'YYYY/M/D' text; parse it while reading, with an
+    # explicit format so no inference runs
+    df = pd.read_sql_query(base_query, conn,
+                           parse_dates={'Order_Date': {'format': '%Y/%m/%d'}})
+    # Keep rows in date order so date ranges can be cut by binary search
+    df = df.sort_values('Order_Date', kind='stable', ignore_index=True)
+    # Integer year*100+month key: cheaper to group on than formatted strings
+    df['Year_Month'] = (df['Order_Date'].dt.year * 100 + df['Order_Date'].dt.month).astype('int32')
+    df['Weekday'] = df['Order_Date'].dt.dayofweek.astype('int8')
+    # Filter dimensions as categoricals so isin() compares codes, not strings
+    for col in ('City', 'Region', 'Course_Type_Name', 'Customer_Gender'):
+        df[col] = df[col].astype('category')
+    # Narrowest integer dtype that holds the ids, ages and amounts (sums still widen to int64)
+    for col in ('Transaction_id', 'Student_id', 'Customer_Age', 'Amount'):
+        df[col] = pd.to_numeric(df[col], downcast='integer')
     return df
 
-def load_data_MR():
-    """Load data for Monthly Revenue"""
-    df = load_transaction_data()
-    df['Month_Year'] = df['Order_Date'].dt.to_period('M').astype(str)
-    monthly_revenue = df.groupby('Month_Year')['Amount'].sum().reset_index()
-    monthly_revenue['Growth_Rate'] = monthly_revenue['Amount'].pct_change() * 100
-    return monthly_revenue
+# Weekday names indexed by pandas' dayofweek codes (Monday=0)
+DAYS_ORDER = ['Monday', 'Tuesday', 'Wednesday', 'Thursday', 'Friday', 'Saturday', 'Sunday']
+# Student age group labels of the teacher heatmaps
+AGE_GROUPS = ['0-20', '21-30', '31-40', '41-50', '50+']
+# Month abbreviations indexed by month number - 1
+MONTH_ABBRS = ['Jan', 'Feb', 'Mar', 'Apr', 'May', 'Jun',
+               'Jul', 'Aug', 'Sep', 'Oct', 'Nov', 'Dec']
+
+def load_revenue_rollup():
+    """Roll transactions up to revenue per (date, city, course, gender, age)"""
+    # Year_Month and Weekday follow from Order_Date; they are carried along for grouping
+    dims = ['Order_Date', 'Year_Month', 'Weekday', 'City', 'Course_Type_Name', 'Customer_Gender', 'Customer_Age']
+    # Sum the downcast amounts in int64, so the charts' sums stay integers without overflowing
+    amounts = base_data['Amount'].astype('int64')
+    return amounts.groupby([base_data[dim] for dim in dims], observed=True, dropna=False).sum().reset_index()
+
+# Category filters the transaction frames are pre-partitioned on, in order
+SLAB_KEYS = ['City', 'Course_Type_Name', 'Customer_Gender']
+
+def partition_slabs(df):
+    """Row positions of a transaction frame per (city, course, gender) combination"""
+    return df.groupby(SLAB_KEYS, observed=True, dropna=False).indices
+
+def year_month_labels(keys):
+    """Format integer Year_Month keys as 'YYYY-MM' strings"""
+    return [f"{key // 100}-{key % 100:02d}" for key in keys]
+
+def growth_rate(amounts):
+    """Period-over-period growth in percent; the first period has none"""
+    amounts = np.asarray(amounts, dtype='float64')
+    growth = np.empty_like(amounts)
+    growth[:1] = np.nan
+    with np.errstate(divide='ignore', invalid='ignore'):
+        growth[1:] = (amounts[1:] / amounts[:-1] - 1) * 100
+    return growth
 
 def load_data_DA():
     """Load data for Demographic Analysis"""
     conn = get_db_connection()
-    cursor = conn.cursor()
     
     # Verify if tables exist
-    cursor.execute("""
-        SELECT name FROM sqlite_master 
-        WHERE type='table' AND name IN ('student_basic', 'student_learning_area', 
-                                      'student_learning_type', 'course_student')
-    """)
-    existing_tables = cursor.fetchall()
-    existing_tables = [table[0] for table in existing_tables]
-    
     required_tables = ['student_basic', 'student_learning_area', 
                       'student_learning_type', 'course_student']
+    cursor = conn.execute("""
+        SELECT name FROM sqlite_master 
+        WHERE type='table' AND name IN (?, ?, ?, ?)
+    """, required_tables)
+    existing_tables = {table for (table,) in cursor}
+    cursor.close()
     
-    missing_tables = set(required_tables) - set(existing_tables)
+    missing_tables = set(required_tables) - existing_tables
     if missing_tables:
         raise Exception(f"Missing tables in database: {missing_tables}")
 
@@ -173,9 +251,9 @@ def load_data_DA():
     SELECT 
         sb.StudentID,
         sb.Age,
-        sb.Gender,
+        COALESCE(sb.Gender, 'Unknown') AS Gender,
         sla.City,
-        sla.[Learning Area],
+        COALESCE(sla.[Learning Area], 'Unknown') AS [Learning Area],
         cs.Course_Type_id
     FROM 
         student_basic sb
@@ -189,26 +267,28 @@ def load_data_DA():
 
     # Execute query and load into dataframe
     DA_data = pd.read_sql_query(query, conn)
-    conn.close()
     
     # Validate data
     if DA_data.empty:
         raise Exception("No data was retrieved from the database")
     
-    # Define course type mapping
+    # Define course type mapping (categorical labels indexed by Course_Type_id)
     course_data = pd.DataFrame({
-        "Course_Type_id": [1, 2, 3],
-        "Course_Type_Name": ["瑜珈", "律動", "舞蹈"],
-        "Course_Type_Note": ["Yoga Classes", "Rhythmic Movement Classes", "Dance Classes"]
-    })
-
-    # Merge course data
-    DA_data = DA_data.merge(course_data, on="Course_Type_id", how="left")
-
-    # Clean data
-    DA_data['Gender'] = DA_data['Gender'].fillna('Unknown')
-    DA_data['Learning Area'] = DA_data['Learning Area'].fillna('Unknown')
-    DA_data['Course_Type_id'] = DA_data['Course_Type_id'].fillna('Unknown')
+        "Course_Type_Name": pd.Categorical(["瑜珈", "律動", "舞蹈"]),
+        "Course_Type_Note": pd.Categorical(["Yoga Classes", "Rhythmic Movement Classes", "Dance Classes"])
+    }, index=pd.Index([1, 2, 3], name="Course_Type_id"))
+
+    # Look the labels up by id position instead of merging (students without a course stay NaN)
+    DA_data['Course_Type_id'] = DA_data['Course_Type_id'].astype('Int8')
+    positions = course_data.index.get_indexer(DA_data['Course_Type_id'])
+    for col in course_data.columns:
+        DA_data[col] = course_data[col].array.take(positions, allow_fill=True)
+
+    # Low-cardinality string columns as categoricals
+    for col in ('Gender', 'City', 'Learning Area'):
+        DA_data[col] = DA_data[col].astype('category')
+    for col in ('StudentID', 'Age'):
+        DA_data[col] = pd.to_numeric(DA_data[col], downcast='integer')
 
     return DA_data
 
@@ -218,944 +298,112 @@ def load_data_TP():
     query = """
         SELECT 
             tb.TeacherID AS Teacher_ID,
-            tb.FirstName || ' ' || tb.LastName AS Teacher_Name,
+            COALESCE(tb.FirstName || ' ' || tb.LastName, 'Unknown') AS Teacher_Name,
             sb.StudentID AS Student_ID,
-            sb.Gender AS Student_Gender,
+            COALESCE(sb.Gender, 'Unknown') AS Student_Gender,
             sb.Age AS Student_Age,
             sla.City AS Learning_City,
-            sla.[Learning Area] AS Learning_Area,
             ch.Course_Date
         FROM course_history ch
         LEFT JOIN teacher_basic tb ON ch.Teacher_id = tb.TeacherID
         LEFT JOIN course_student cs ON ch.Course_id = cs.Course_id
-        LEFT JOIN course_basic cb ON cs.Course_Type_id = cb.Course_Type_id
         LEFT JOIN student_learning_area sla ON cs.Student_id = sla.StudentID
         LEFT JOIN student_basic sb ON cs.Student_id = sb.StudentID
         ORDER BY ch.Teacher_id
     """
     
     try:
-        TP_Data = pd.read_sql_query(query, conn)
+        TP_Data = pd.read_sql_query(query, conn,
+                                    parse_dates={'Course_Date': {'format': '%Y-%m-%d'}})
         
         if not TP_Data.empty:
-            # Ensure columns are in the correct order
-            column_order = [
-                'Teacher_ID',
-                'Teacher_Name',
-                'Student_ID',
-                'Student_Gender',
-                'Student_Age',
-                'Learning_City',
-                'Learning_Area',
-                'Course_Date'
-            ]
-            
-            # Reorder columns and fill any missing values
-            TP_Data = TP_Data.reindex(columns=column_order)
-            TP_Data = TP_Data.fillna({
-                'Teacher_Name': 'Unknown',
-                'Student_Gender': 'Unknown', 
-                'Learning_Area': 'Unknown'
-            })
+            # Column order and the 'Unknown' fill come straight from the query
+            for col in ('Teacher_Name', 'Learning_City', 'Student_Gender'):
+                TP_Data[col] = TP_Data[col].astype('category')
+            for col in ('Teacher_ID', 'Student_ID', 'Student_Age'):
+                TP_Data[col] = pd.to_numeric(TP_Data[col], downcast='integer')
             
-            # Calculate metrics
-            TP_Data['Course_Date'] = pd.to_datetime(TP_Data['Course_Date'])
-            
-            
-            # Calculate years of experience based on first course date
-            TP_Data['First_Course'] = TP_Data.groupby('Teacher_ID')['Course_Date'].transform('min')
-            TP_Data = TP_Data.drop('First_Course', axis=1)
+            TP_Data['Course_Month'] = (TP_Data['Course_Date'].dt.year * 100 + TP_Data['Course_Date'].dt.month).astype('int32')
+            # Student age groups: (0,20], (20,30], (30,40], (40,50], (50,100]
+            TP_Data['Age_Group'] = pd.cut(TP_Data['Student_Age'], bins=[0, 20, 30, 40, 50, 100],
+                                          labels=AGE_GROUPS)
             
             return TP_Data
             
     except Exception as e:
         print(f"Error in load_data_TP: {str(e)}")
         return pd.DataFrame()
-    finally:
-        conn.close()
 
     return pd.DataFrame()
 
-# Load data first
-BT_data = load_data_BT()
-MR_data = load_data_MR()
+# Load data first: transactions plus their revenue roll-up, demographics and teacher data
+base_data = load_transaction_data()
+revenue_rollup = load_revenue_rollup()
+rollup_slabs = partition_slabs(revenue_rollup)
 DA_data = load_data_DA()
 TP_data = load_data_TP()
-base_data = load_transaction_data()
-
-# Check if TP_data loaded successfully
-if TP_data.empty:
-    print("Warning: Teacher performance data is empty")
-else:
-    #print(f"Successfully loaded teacher performance data:")
-    
-    try:
-        if 'Total_Teaching_Hours' in TP_data.columns:
-            print(f"- Total teaching hours: {TP_data['Total_Teaching_Hours'].sum():,.0f}")
-        if 'Total_Revenue' in TP_data.columns:
-            print(f"- Total sales revenue: ${TP_data['Total_Revenue'].sum():,.2f}")
-        if 'Years_of_Experience' in TP_data.columns:
-            print(f"- Average years of experience: {TP_data['Years_of_Experience'].mean():.1f}")
-    except Exception as e:
-        print(f"Warning: Some metrics couldn't be calculated - {str(e)}")
-
-
-
-# Initialize the Dash app
-app = Dash(__name__)
-
-server = app.server
-
-CHART_THEME = 'plotly_dark'
 
-# Update the layout with new text styles
-app.layout = html.Div([
-    # Header section (stays outside tabs)
-    html.Div([
-        html.Div([
-            html.H1("Innodanc Dashboard", 
-                    style=TEXT_STYLES['header']),
-            html.Div([
-                html.P("Developed by Team No.2 Magpies", 
-                       style={'color': COLOR_SCHEME['text'], 'fontSize': '28px', 'marginBottom': '8px'}),
-                html.P("周芸瑄 • 楊誼萱 • 高愷傑 • 林樂瑞", 
-                       style={'color': COLOR_SCHEME['text'], 'fontSize': '24px', 'opacity': '0.9'})
-            ], style={'marginTop': '12px'})
-        ], style={'textAlign': 'center'})
-    ], style={
-        'background': '#ffffff',
-        'marginBottom': '32px',
-        'boxShadow': '0 4px 6px rgba(0,0,0,0.1)',
-        'padding': '24px',
-        'border': f'1px solid {COLOR_SCHEME["secondary"]}'
-    }),
-    
-    # Tabs
-    dcc.Tabs(
-        id='tabs',
-        value='glimpse',
-        children=[
-            dcc.Tab(
-                label='Glimpse',
-                value='glimpse',
-                style=TAB_STYLE,
-                selected_style=TAB_SELECTED_STYLE,
-                children=[
-                    html.Div([
-                        html.H2("Overview Dashboard", style=TEXT_STYLES['section_header']),
-                        
-                        # Key Metrics Row
-                        html.Div([
-                            # Total Revenue Card
-                            html.Div([
-                                html.H3("Total Revenue", style={
-                                    'fontSize': '20px',
-                                    'color': COLOR_SCHEME['text'],
-                                    'marginBottom': '8px'
-                                }),
-                                html.H4(
-                                    f"${base_data['Amount'].sum():,.2f}", 
-                                    style={
-                                        'fontSize': '32px',
-                                        'color': COLOR_SCHEME['primary'],
-                                        'marginTop': '0'
-                                    }
-                                )
-                            ], style={**CARD_STYLE, 'flex': '1', 'textAlign': 'center'}),
-                            
-                            # Total Students Card
-                            html.Div([
-                                html.H3("Total Students", style={
-                                    'fontSize': '20px',
-                                    'color': COLOR_SCHEME['text'],
-                                    'marginBottom': '8px'
-                                }),
-                                html.H4(
-                                    f"{base_data['Student_id'].nunique():,}", 
-                                    style={
-                                        'fontSize': '32px',
-                                        'color': COLOR_SCHEME['primary'],
-                                        'marginTop': '0'
-                                    }
-                                )
-                            ], style={**CARD_STYLE, 'flex': '1', 'textAlign': 'center'}),
-                            
-                            # Total Teachers Card
-                            html.Div([
-                                html.H3("Total Teachers", style={
-                                    'fontSize': '20px',
-                                    'color': COLOR_SCHEME['text'],
-                                    'marginBottom': '8px'
-                                }),
-                                html.H4(
-                                    f"{TP_data['Teacher_ID'].nunique():,}", 
-                                    style={
-                                        'fontSize': '32px',
-                                        'color': COLOR_SCHEME['primary'],
-                                        'marginTop': '0'
-                                    }
-                                )
-                            ], style={**CARD_STYLE, 'flex': '1', 'textAlign': 'center'}),
-                            
-                            # Average Transaction Value Card
-                            html.Div([
-                                html.H3("Avg Transaction Value", style={
-                                    'fontSize': '20px',
-                                    'color': COLOR_SCHEME['text'],
-                                    'marginBottom': '8px'
-                                }),
-                                html.H4(
-                                    f"${base_data['Amount'].mean():,.2f}", 
-                                    style={
-                                        'fontSize': '32px',
-                                        'color': COLOR_SCHEME['primary'],
-                                        'marginTop': '0'
-                                    }
-                                )
-                            ], style={**CARD_STYLE, 'flex': '1', 'textAlign': 'center'})
-                        ], style={'display': 'flex', 'gap': '24px', 'marginBottom': '24px'}),
-                        
-                        # Charts Row
-                        html.Div([
-                            # Revenue Trend
-                            html.Div([
-                                dcc.Graph(id='overview-revenue-trend')
-                            ], style={**CARD_STYLE, 'flex': '1'}),
-                            
-                            # Course Distribution
-                            html.Div([
-                                dcc.Graph(id='overview-course-dist')
-                            ], style={**CARD_STYLE, 'flex': '1'})
-                        ], style={'display': 'flex', 'gap': '24px', 'marginBottom': '24px'}),
-                        
-                        # Bottom Charts Row
-                        html.Div([
-                            # Gender Distribution
-                            html.Div([
-                                dcc.Graph(id='overview-gender-dist')
-                            ], style={**CARD_STYLE, 'flex': '1'}),
-                            
-                            # Age Distribution
-                            html.Div([
-                                dcc.Graph(id='overview-age-dist')
-                            ], style={**CARD_STYLE, 'flex': '1'})
-                        ], style={'display': 'flex', 'gap': '24px'})
-                    ], id='glimpse-content', style={'padding': '24px'})     
-                ]
-            ),
-            
-            # Overview Tab (existing)
-            dcc.Tab(
-                label='Overview',
-                value='overview',
-                style=TAB_STYLE,
-                selected_style=TAB_SELECTED_STYLE,
-                children=[
-                    html.Div([
-                        # Filters section
-                        html.Div([
-                            html.Div([
-                                html.Label("Date Range", style=TEXT_STYLES['label']),
-                                dcc.DatePickerRange(
-                                    id='date-range-combined',
-                                    start_date=base_data['Order_Date'].min(),
-                                    end_date=base_data['Order_Date'].max(),
-                                    display_format='YYYY-MM-DD',
-                                    style={'zIndex': 1000, 'fontSize': '16px'}
-                                )
-                            ], style={'flex': '1', 'marginRight': '32px'}),
-                            
-                            html.Div([
-                                html.Label("Age Range", style=TEXT_STYLES['label']),
-                                dcc.RangeSlider(
-                                    id='age-range-demo',
-                                    min=DA_data['Age'].min(),
-                                    max=DA_data['Age'].max(),
-                                    step=1,
-                                    marks={i: {'label': str(i), 'style': {'color': COLOR_SCHEME['text'], 'fontSize': '14px'}} 
-                                           for i in range(int(DA_data['Age'].min()), int(DA_data['Age'].max()) + 1, 5)},
-                                    value=[DA_data['Age'].min(), DA_data['Age'].max()]
-                                )
-                            ], style={'flex': '1', 'marginRight': '24px'}),
-                            
-                            html.Div([
-                                html.Label("Course Type", style=TEXT_STYLES['label']),
-                                dcc.Dropdown(
-                                    id='course-type-combined',
-                                    options=[{'label': course, 'value': course} 
-                                           for course in base_data['Course_Type_Name'].unique()],
-                                    multi=True,
-                                    style={'borderRadius': '8px', 'fontSize': '28px'}
-                                )
-                            ], style={'flex': '1', 'marginRight': '24px'}),
-                            
-                            html.Div([
-                                html.Label("City", style=TEXT_STYLES['label']),
-                                dcc.Dropdown(
-                                    id='region-revenue',
-                                    options=[{'label': City, 'value': City} 
-                                           for City in DA_data['City'].unique()],
-                                    multi=True,
-                                    style={'borderRadius': '8px', 'fontSize': '28px'}
-                                )
-                            ], style={'flex': '1', 'marginRight': '24px'}),
-                            
-                            html.Div([
-                                html.Label("Gender", style=TEXT_STYLES['label']),
-                                dcc.Dropdown(
-                                    id='gender-dropdown',
-                                    options=[{'label': gender, 'value': gender} 
-                                           for gender in base_data['Customer_Gender'].unique()],
-                                    multi=True,
-                                    style={'borderRadius': '8px', 'fontSize': '28px'}
-                                ),
-                            ], style={'flex': '1'})
-                        ], style={**CARD_STYLE, 'display': 'flex', 'alignItems': 'flex-end', 'gap': '24px'}),
-                        # Revenue & Booking Analysis Section
-                        html.Div([
-                            html.H2("Revenue & Booking Analysis", style=TEXT_STYLES['section_header']),
-                            html.Div([
-                                html.Div([
-                                    dcc.Graph(
-                                        id='monthly-revenue-chart', 
-                                        style={'width': '100%', 'height': '600px'}
-                                    ),
-                                    html.Span(
-                                        "ⓘ",  # Info icon
-                                        id="info-icon-monthly-revenue-chart",
-                                        style={
-                                            "fontSize": "20px",
-                                            "cursor": "pointer",
-                                            "color": "#007BFF",
-                                            "position": "relative",
-                                            "top": "-50px",
-                                            "left": "10px"
-                                        }
-                                    ),
-                                    dbc.Tooltip(
-                                        [
-                                            html.Ul([
-                                                html.Li("Users: Operating Officers, Finance Team"),
-                                                html.Li("Purpose: Monitor revenue and growth trends to guide resource allocation and planning."),
-                                                html.Li("Chart: Combination (Bar + Line)"),
-                                                html.Ul([
-                                                    html.Li("Bar Chart: X = Months, Y = Monthly Revenue"),
-                                                    html.Li("Line Chart: Y = Growth Rate (%)")
-                                                ]),
-                                                html.Li("Insights:"),
-                                                html.Ul([
-                                                    html.Li("Identify peak revenue months and contributing factors."),
-                                                    html.Li("Track trends in revenue growth or decline."),
-                                                    html.Li("Assess effectiveness of campaigns and seasonal strategies.")
-                                                ])
-                                            ])
-                                        ],
-                                        target="info-icon-monthly-revenue-chart",
-                                        placement="right",
-                                        style={"fontSize": "14px"}
-                                    )
-                                ], style={"position": "relative", "width": "48%", "display": "inline-block", "marginRight": "2%"}),
-                                html.Div([
-                                    dcc.Graph(
-                                        id='booking-heatmap', 
-                                        style={'width': '100%', 'height': '600px'}
-                                    ),
-                                    html.Span(
-                                        "ⓘ",  # Info icon
-                                        id="info-icon-booking-heatmap",
-                                        style={
-                                            "fontSize": "20px",
-                                            "cursor": "pointer",
-                                            "color": "#007BFF",
-                                            "position": "relative",
-                                            "top": "-50px",
-                                            "left": "10px"
-                                        }
-                                    ),
-                                    dbc.Tooltip(
-                                        [
-                                            html.Ul([
-                                                html.Li("Users: Marketing, Customer Support Teams"),
-                                                html.Li("Purpose: Analyze student order patterns over time."),
-                                                html.Li("Chart: Heatmap"),
-                                                html.Ul([
-                                                    html.Li("X-Axis: Months (January to December)."),
-                                                    html.Li("Y-Axis: Days of the week (Monday to Sunday)."),
-                                                    html.Li("Color Scale: Represents the volume of orders placed.")
-                                                ]),
-                                                html.Li("Insights:"),
-                                                html.Ul([
-                                                    html.Li("Detect peak days and months for student purchases."),
-                                                    html.Li("Align marketing efforts and promotions with high-order periods."),
-                                                    html.Li("Adjust operational resources to cater to peak demand times, ensuring seamless service.")
-                                                ])
-                                            ])
-                                        ],
-                                        target="info-icon-booking-heatmap",
-                                        placement="right",
-                                        style={"fontSize": "14px"}
-                                    )
-
-                                ], style={"position": "relative", "width": "48%", "display": "inline-block", "marginLeft": "2%"})
-                            ], style={'display': 'flex', 'justifyContent': 'center', 'alignItems': 'center', 'width': '100%'})
-                        ], style=CARD_STYLE),
-
-                        # Teacher Performance Analysis Section
-                        html.Div([
-                            html.H2("Teacher Performance Analysis", style=TEXT_STYLES['section_header']),
-                            html.Div([
-                                html.Div([
-                                    dcc.Graph(
-                                        id='teacher-class-trend', 
-                                        style={'width': '100%', 'height': '600px'}
-                                    ),
-                                    html.Span(
-                                        "ⓘ",  # Info icon
-                                        id="info-icon-teacher-class-trend",
-                                        style={
-                                            "fontSize": "20px",
-                                            "cursor": "pointer",
-                                            "color": "#007BFF",
-                                            "position": "relative",
-                                            "top": "-50px",
-                                            "left": "10px"
-                                        }
-                                    ),
-                                    dbc.Tooltip(
-                                        [
-                                        html.Ul([
-                                            html.Li("Users: Operating Officers, Finance Team"),
-                                            html.Li("Purpose: Analyze top 5 teachers' sales and monthly distribution for better planning."),
-                                            html.Li("Chart: Stacked Bar (X: Teacher names, Y: Courses sold, Monthly data)"),
-                                            html.Li("Insights:"),
-                                            html.Ul([
-                                                html.Li("Highlight top-performing teachers."),
-                                                html.Li("Understand sales seasonality."),
-                                                html.Li("Identify areas for support or incentives.")
-                                            ])
-                                        ])
-                                        ],
-                                        target="info-icon-teacher-class-trend",
-                                        placement="right",
-                                        style={"fontSize": "14px"}
-                                    )
-                                ], style={"position": "relative", "width": "48%", "display": "inline-block", "marginRight": "2%"}),
-                                html.Div([
-                                    dcc.Graph(
-                                        id='teacher-student-heatmap', 
-                                        style={'width': '100%', 'height': '600px'}
-                                    ),
-                                    html.Span(
-                                        "ⓘ",  # Info icon
-                                        id="info-icon-teacher-student-heatmap",
-                                        style={
-                                            "fontSize": "20px",
-                                            "cursor": "pointer",
-                                            "color": "#007BFF",
-                                            "position": "relative",
-                                            "top": "-50px",
-                                            "left": "10px"
-                                        }
-                                    ),
-                                    dbc.Tooltip(
-                                        [
-                                            html.Ul([
-                                                html.Li("Users: Marketing, Customer Support Teams"),
-                                                html.Li("Purpose: Analyze age distribution of students for top 5 teachers."),
-                                                html.Li("Chart: Heatmap"),
-                                                html.Ul([
-                                                    html.Li("X-Axis: Age groups (0-20, 21-30, 31-40, 41-50, 50+)"),
-                                                    html.Li("Y-Axis: Top 5 teachers"),
-                                                    html.Li("Color Scale: Unique students per age group")
-                                                ]),
-                                                html.Li("Insights:"),
-                                                html.Ul([
-                                                    html.Li("Identify primary audience age groups for each teacher."),
-                                                    html.Li("Highlight underserved age demographics."),
-                                                    html.Li("Support tailored course design and learning experiences.")
-                                                ])
-                                            ])
-                                        ],
-                                        target="info-icon-teacher-student-heatmap",
-                                        placement="right",
-                                        style={"fontSize": "14px"}
-                                    ),                                   
-                                ], style={"position": "relative", "width": "48%", "display": "inline-block", "marginLeft": "2%"})
-                            ], style={'display': 'flex', 'justifyContent': 'center', 'alignItems': 'center', 'width': '100%'})
-                        ], style=CARD_STYLE),
-
-                        # Student Demographic Analysis Section
-                        html.Div([
-                            html.H2("Student Demographic Analysis", style=TEXT_STYLES['section_header']),
-                            html.Div([
-                                html.Button('Gender Distribution', id='btn-gender', n_clicks=0, style=BUTTON_STYLE),
-                                html.Button('Age Distribution', id='btn-age', n_clicks=0, style=BUTTON_STYLE),
-                                html.Button('Course Distribution', id='btn-course', n_clicks=0, style=BUTTON_STYLE),
-                                html.Button('Region Distribution', id='btn-region', n_clicks=0, style=BUTTON_STYLE),
-                                html.Button('Age by Course Type', id='btn-age-course', n_clicks=0, style=BUTTON_STYLE)
-                            ], style={'textAlign': 'center', 'marginBottom': '24px'}),
-                            html.Div([
-                                html.Div([
-                                    dcc.Graph(
-                                        id='demographics-chart', 
-                                        style={'width': '100%', 'height': '600px'}
-                                    ),
-                                    html.Span(
-                                        "ⓘ",  # Info icon
-                                        id="info-icon-demographics-chart",
-                                        style={
-                                            "fontSize": "20px",
-                                            "cursor": "pointer",
-                                            "color": "#007BFF",
-                                            "position": "left",
-                                            "top": "-50px",
-                                            "left": "-10px"
-                                        }
-                                    ),
-                                    dbc.Tooltip(
-                                        [
-                                            html.Ul([
-                                                html.Li("Users: Marketing, Customer Support Teams"),
-                                                html.Li("Purpose: Understand student demographics (gender, age, region) for personalized service and growth."),
-                                                html.Li("Chart Details:"),
-                                                html.Ul([
-                                                    html.Li("Pie Chart: Gender distribution (Male, Female)"),
-                                                    html.Li("Histogram: X = Age groups, Y = Number of students"),
-                                                    html.Li("Bar Chart: X = Geographic regions, Y = Students per region"),
-                                                    html.Li("Interactive: Demographic filters with buttons")
-                                                ]),
-                                                html.Li("Insights:"),
-                                                html.Ul([
-                                                    html.Li("Understand gender and age composition for marketing and course customization."),
-                                                    html.Li("Identify regions with high/low student participation."),
-                                                    html.Li("Support regional and demographic-specific outreach.")
-                                                ])
-                                            ])
-                                        ],
-                                        target="info-icon-demographics-chart",
-                                        placement="right",
-                                        style={"fontSize": "14px"}
-                                    ),
-                                ], style={"position": "relative", "width": "100%", "display": "inline-block"})
-                            ], style={'textAlign': 'left', 'marginBottom': '24px'})
-                        ], style=CARD_STYLE)
-                    ], id='overview-content')
-                ]
-            ),     
-            # Operation & Finance Tab (existing)
-            dcc.Tab(
-                label='Operation & Finance',
-                value='operation',
-                style=TAB_STYLE,
-                selected_style=TAB_SELECTED_STYLE,
-                children=[
-                    html.Div([
-                        # ... existing operation content ...
-                        # Filters section
-                        html.Div([
-                            html.Div([
-                                html.Label("Date Range", style=TEXT_STYLES['label']),
-                                dcc.DatePickerRange(
-                                    id='operation-date-range-combined',
-                                    start_date=base_data['Order_Date'].min(),
-                                    end_date=base_data['Order_Date'].max(),
-                                    display_format='YYYY-MM-DD',
-                                    style={'zIndex': 1000, 'fontSize': '16px'}
-                                )
-                            ], style={'flex': '1', 'marginRight': '32px'}),
-                            
-                            html.Div([
-                                html.Label("Age Range", style=TEXT_STYLES['label']),
-                                dcc.RangeSlider(
-                                    id='operation-age-range-demo',
-                                    min=DA_data['Age'].min(),
-                                    max=DA_data['Age'].max(),
-                                    step=1,
-                                    marks={i: {'label': str(i), 'style': {'color': COLOR_SCHEME['text'], 'fontSize': '14px'}} 
-                                           for i in range(int(DA_data['Age'].min()), int(DA_data['Age'].max()) + 1, 5)},
-                                    value=[DA_data['Age'].min(), DA_data['Age'].max()]
-                                )
-                            ], style={'flex': '1', 'marginRight': '24px'}),
-                            
-                            html.Div([
-                                html.Label("Course Type", style=TEXT_STYLES['label']),
-                                dcc.Dropdown(
-                                    id='operation-course-type-combined',
-                                    options=[{'label': course, 'value': course} 
-                                           for course in base_data['Course_Type_Name'].unique()],
-                                    multi=True,
-                                    style={'borderRadius': '8px', 'fontSize': '28px'}
-                                )
-                            ], style={'flex': '1', 'marginRight': '24px'}),
-                            
-                            html.Div([
-                                html.Label("City", style=TEXT_STYLES['label']),
-                                dcc.Dropdown(
-                                    id='operation-region-revenue',
-                                    options=[{'label': City, 'value': City} 
-                                           for City in DA_data['City'].unique()],
-                                    multi=True,
-                                    style={'borderRadius': '8px', 'fontSize': '28px'}
-                                )
-                            ], style={'flex': '1', 'marginRight': '24px'}),
-                            
-                            html.Div([
-                                html.Label("Gender", style=TEXT_STYLES['label']),
-                                dcc.Dropdown(
-                                    id='operation-gender-dropdown',
-                                    options=[{'label': gender, 'value': gender} 
-                                           for gender in base_data['Customer_Gender'].unique()],
-                                    multi=True,
-                                    style={'borderRadius': '8px', 'fontSize': '28px'}
-                                ),
-                            ], style={'flex': '1'})
-                        ], style={**CARD_STYLE, 'display': 'flex', 'alignItems': 'flex-end', 'gap': '24px'}),
-                        
-                        # Revenue & Booking Analysis Section
-                        html.Div([
-                            html.H2("Revenue & Booking Analysis", style=TEXT_STYLES['section_header']),
-                                html.Div([
-                                    dcc.Graph(
-                                        id='operation-monthly-revenue-chart',
-                                        style={'width': '100%', 'height': '600px'}
-                                    ),
-                                    html.Span(
-                                        "ⓘ",  # Info icon
-                                        id="info-icon-operation-monthly-revenue-chart",
-                                        style={
-                                            "fontSize": "20px",
-                                            "cursor": "pointer",
-                                            "color": "#007BFF",
-                                            "position": "relative",  # 相對定位
-                                            "top": "-50px",          # 微調位置
-                                            "left": "10px"
-                                        }
-                                    ),
-                                    dbc.Tooltip(
-                                        [
-                                            html.Ul([
-                                                html.Li("Users: Operating Officers, Finance Team"),
-                                                html.Li("Purpose: Monitor revenue and growth trends to guide resource allocation and planning."),
-                                                html.Li("Chart: Combination (Bar + Line)"),
-                                                html.Ul([
-                                                    html.Li("Bar Chart: X = Months, Y = Monthly Revenue"),
-                                                    html.Li("Line Chart: Y = Growth Rate (%)")
-                                                ]),
-                                                html.Li("Insights:"),
-                                                html.Ul([
-                                                    html.Li("Identify peak revenue months and contributing factors."),
-                                                    html.Li("Track trends in revenue growth or decline."),
-                                                    html.Li("Assess effectiveness of campaigns and seasonal strategies.")
-                                                ])
-                                            ])
-                                        ],
-                                        target="info-icon-operation-monthly-revenue-chart",
-                                        placement="right",
-                                        style={"fontSize": "14px"}
-                                    )
- 
-                                 ], style={"position": "relative", "width": "48%", "display": "inline-block", "marginRight": "2%"}),
-                                html.Div([
-                                    dcc.Graph(
-                                        id='operation-teacher-class-trend', 
-                                        style={'width': '100%', 'display': 'inline-block', 'marginRight': '2%'}
-                                    ),
-                                    html.Span(
-                                        "ⓘ",  # Info icon
-                                        id="info-icon-operation-teacher-class-trend",
-                                        style={
-                                            "fontSize": "20px",
-                                            "cursor": "pointer",
-                                            "color": "#007BFF",
-                                            "position": "relative",  # 相對定位
-                                            "top": "-50px",          # 微調位置
-                                            "left": "10px"
-                                        }
-                                    ),
-                                    dbc.Tooltip(
-                                    [
-                                        html.Ul([
-                                            html.Li("Users: Operating Officers, Finance Team"),
-                                            html.Li("Purpose: Analyze top 5 teachers' sales and monthly distribution for better planning."),
-                                            html.Li("Chart: Stacked Bar (X: Teacher names, Y: Courses sold, Monthly data)"),
-                                            html.Li("Insights:"),
-                                            html.Ul([
-                                                html.Li("Highlight top-performing teachers."),
-                                                html.Li("Understand sales seasonality."),
-                                                html.Li("Identify areas for support or incentives.")
-                                            ])
-                                        ])
-                                    ],
-                                    target="info-icon-operation-teacher-class-trend",
-                                    placement="right",
-                                    style={"fontSize": "14px"}
-                                )
-                                ], style={"position": "relative", "width": "48%", "display": "inline-block", "marginLeft": "2%"})
-                        ], style=CARD_STYLE),
-                    ], id='operation-content', style={'display': 'none'})
-                ]
-            ),
-            # marketing and customer support tab
-            dcc.Tab(
-                label='Marketing and Customer Support',
-                value='marketing',
-                style=TAB_STYLE,
-                selected_style=TAB_SELECTED_STYLE,
-                children=[
-                    html.Div([
-                        # ... existing operation content ...
-                        # Filters section
-                        html.Div([
-                            html.Div([
-                                html.Label("Date Range", style=TEXT_STYLES['label']),
-                                dcc.DatePickerRange(
-                                    id='marketing-date-range-combined',
-                                    start_date=base_data['Order_Date'].min(),
-                                    end_date=base_data['Order_Date'].max(),
-                                    display_format='YYYY-MM-DD',
-                                    style={'zIndex': 1000, 'fontSize': '16px'}
-                                )
-                            ], style={'flex': '1', 'marginRight': '32px'}),
-                            
-                            html.Div([
-                                html.Label("Age Range", style=TEXT_STYLES['label']),
-                                dcc.RangeSlider(
-                                    id='marketing-age-range-demo',
-                                    min=DA_data['Age'].min(),
-                                    max=DA_data['Age'].max(),
-                                    step=1,
-                                    marks={i: {'label': str(i), 'style': {'color': COLOR_SCHEME['text'], 'fontSize': '14px'}} 
-                                           for i in range(int(DA_data['Age'].min()), int(DA_data['Age'].max()) + 1, 5)},
-                                    value=[DA_data['Age'].min(), DA_data['Age'].max()]
-                                )
-                            ], style={'flex': '1', 'marginRight': '24px'}),
-                            
-                            html.Div([
-                                html.Label("Course Type", style=TEXT_STYLES['label']),
-                                dcc.Dropdown(
-                                    id='marketing-course-type-combined',
-                                    options=[{'label': course, 'value': course} 
-                                           for course in base_data['Course_Type_Name'].unique()],
-                                    multi=True,
-                                    style={'borderRadius': '8px', 'fontSize': '28px'}
-                                )
-                            ], style={'flex': '1', 'marginRight': '24px'}),
-                            
-                            html.Div([
-                                html.Label("City", style=TEXT_STYLES['label']),
-                                dcc.Dropdown(
-                                    id='marketing-region-revenue',
-                                    options=[{'label': City, 'value': City} 
-                                           for City in DA_data['City'].unique()],
-                                    multi=True,
-                                    style={'borderRadius': '8px', 'fontSize': '28px'}
-                                )
-                            ], style={'flex': '1', 'marginRight': '24px'}),
-                            
-                            html.Div([
-                                html.Label("Gender", style=TEXT_STYLES['label']),
-                                dcc.Dropdown(
-                                    id='marketing-gender-dropdown',
-                                    options=[{'label': gender, 'value': gender} 
-                                           for gender in base_data['Customer_Gender'].unique()],
-                                    multi=True,
-                                    style={'borderRadius': '8px', 'fontSize': '28px'}
-                                ),
-                            ], style={'flex': '1'})
-                        ], style={**CARD_STYLE, 'display': 'flex', 'alignItems': 'flex-end', 'gap': '24px'}),
-                        
-                        # Student Booking Time and Recommend Teacher Analysis
-                        html.Div([
-                            html.H2(
-                                "Student Booking Time and Recommend Teacher Analysis", 
-                                style=TEXT_STYLES['section_header']
-                            ),
-                            html.Div([
-                                html.Div([
-                                    dcc.Graph(
-                                        id='marketing-booking-heatmap', 
-                                        style={'width': '100%', 'height': '600px'}
-                                    ),
-                                    html.Span(
-                                        "ⓘ",  # Info icon
-                                        id="info-icon-marketing-booking-heatmap",
-                                        style={
-                                            "fontSize": "20px",
-                                            "cursor": "pointer",
-                                            "color": "#007BFF",
-                                            "position": "relative",  # 相對定位
-                                            "top": "-50px",          # 微調位置
-                                            "left": "10px"
-                                        }
-                                    ),
-                                    dbc.Tooltip(
-                                        [
-                                            html.Ul([
-                                                html.Li("Users: Marketing, Customer Support Teams"),
-                                                html.Li("Purpose: Analyze student order patterns over time."),
-                                                html.Li("Chart: Heatmap"),
-                                                html.Ul([
-                                                    html.Li("X-Axis: Months (January to December)."),
-                                                    html.Li("Y-Axis: Days of the week (Monday to Sunday)."),
-                                                    html.Li("Color Scale: Represents the volume of orders placed.")
-                                                ]),
-                                                html.Li("Insights:"),
-                                                html.Ul([
-                                                    html.Li("Detect peak days and months for student purchases."),
-                                                    html.Li("Align marketing efforts and promotions with high-order periods."),
-                                                    html.Li("Adjust operational resources to cater to peak demand times, ensuring seamless service.")
-                                                ])
-                                            ])
-                                        ],
-                                        target="info-icon-marketing-booking-heatmap",
-                                        placement="right",
-                                        style={"fontSize": "14px"}
-                                    )
-                                ], style={"position": "relative", "width": "48%", "display": "inline-block", "marginRight": "2%"}),
-
-                                html.Div([
-                                    dcc.Graph(
-                                        id='marketing-teacher-student-heatmap', 
-                                        style={'width': '100%', 'height': '600px'}
-                                    ),
-                                    html.Span(
-                                        "ⓘ",  # Info icon
-                                        id="info-icon-marketing-teacher-student-heatmap",
-                                        style={
-                                            "fontSize": "20px",
-                                            "cursor": "pointer",
-                                            "color": "#007BFF",
-                                            "position": "relative",  # 相對定位
-                                            "top": "-50px",          # 微調位置
-                                            "left": "10px"
-                                        }
-                                    ),
-                                    dbc.Tooltip(
-                                        [
-                                            html.Ul([
-                                                html.Li("Users: Marketing, Customer Support Teams"),
-                                                html.Li("Purpose: Analyze age distribution of students for top 5 teachers."),
-                                                html.Li("Chart: Heatmap"),
-                                                html.Ul([
-                                                    html.Li("X-Axis: Age groups (0-20, 21-30, 31-40, 41-50, 50+)"),
-                                                    html.Li("Y-Axis: Top 5 teachers"),
-                                                    html.Li("Color Scale: Unique students per age group")
-                                                ]),
-                                                html.Li("Insights:"),
-                                                html.Ul([
-                                                    html.Li("Identify primary audience age groups for each teacher."),
-                                                    html.Li("Highlight underserved age demographics."),
-                                                    html.Li("Support tailored course design and learning experiences.")
-                                                ])
-                                            ])
-                                        ],
-                                        target="info-icon-marketing-teacher-student-heatmap",
-                                        placement="right",
-                                        style={"fontSize": "14px"}
-                                    ),                                   
-                                ], style={"position": "relative", "width": "48%", "display": "inline-block", "marginRight": "2%"}),
-                            ], style={'display': 'flex', 'justifyContent': 'center', 'alignItems': 'center', 'width': '100%'})
-                        ], style=CARD_STYLE),
-                        
-                        # Demographics Section (now after Teacher Performance)
-                        html.Div([
-                            html.H2("Student Demographic Analysis", 
-                                    style=TEXT_STYLES['section_header']),
-                            html.Div([
-                                html.Button('Gender Distribution', id='marketing-btn-gender', n_clicks=0, style=BUTTON_STYLE),
-                                html.Button('Age Distribution', id='marketing-btn-age', n_clicks=0, style=BUTTON_STYLE),
-                                html.Button('Course Distribution', id='marketing-btn-course', n_clicks=0, style=BUTTON_STYLE),
-                                html.Button('Region Distribution', id='marketing-btn-region', n_clicks=0, style=BUTTON_STYLE),
-                                html.Button('Age by Course Type', id='marketing-btn-age-course', n_clicks=0, style=BUTTON_STYLE)
-                            ], style={'textAlign': 'center', 'marginBottom': '24px'}),
-                            dcc.Graph(id='marketing-demographics-chart', style={'width': '100%', 'height': '600px'}),
-                            html.Span(
-                                "ⓘ",  # Info icon
-                                id="info-icon-marketing-demographics-chart",
-                                style={
-                                    "fontSize": "20px",
-                                    "cursor": "pointer",
-                                    "color": "#007BFF",
-                                    "position": "relative",  # Relative positioning
-                                    "top": "-50px",          # Adjust position slightly
-                                    "left": "10px"
-                                }
-                            ),
-                            dbc.Tooltip(
-                                [
-                                    html.Ul([
-                                        html.Li("Users: Marketing, Customer Support Teams"),
-                                        html.Li("Purpose: Understand student demographics (gender, age, region) for personalized service and growth."),
-                                        html.Li("Chart Details:"),
-                                        html.Ul([
-                                            html.Li("Pie Chart: Gender distribution (Male, Female)"),
-                                            html.Li("Histogram: X = Age groups, Y = Number of students"),
-                                            html.Li("Bar Chart: X = Geographic regions, Y = Students per region"),
-                                            html.Li("Interactive: Demographic filters with buttons")
-                                        ]),
-                                        html.Li("Insights:"),
-                                        html.Ul([
-                                            html.Li("Understand gender and age composition for marketing and course customization."),
-                                            html.Li("Identify regions with high/low student participation."),
-                                            html.Li("Support regional and demographic-specific outreach.")
-                                        ])
-                                    ])
-                                ],
-                                target="info-icon-marketing-demographics-chart",
-                                placement="right",
-                                style={"fontSize": "14px"}
-                            ),
-                        ], style=CARD_STYLE)
-                    ], id='marketing-content', style={'display': 'none'})
-                ]
-            )
-        ],
-        style={
-            'backgroundColor': 'transparent',
-            'borderBottom': '1px solid #d6d6d6',
-            'marginBottom': '24px',
-            'padding': '0 24px'
-        }
-    ),
-], style={
-    'backgroundColor': COLOR_SCHEME['background'],
-    'minHeight': '100vh',
-    'padding': '24px',
-    'fontFamily': '"Segoe UI", Arial, sans-serif'
-})
+# Dropdown options of the shared filter panel, read from the category labels
+COURSE_OPTIONS = [{'label': course, 'value': course}
+                  for course in base_data['Course_Type_Name'].cat.categories]
+CITY_OPTIONS = [{'label': City, 'value': City} for City in DA_data['City'].cat.categories]
+GENDER_OPTIONS = [{'label': gender, 'value': gender}
+                  for gender in base_data['Customer_Gender'].cat.categories]
+# Date picker and age slider bounds of the shared filter panel
+ORDER_DATE_MIN, ORDER_DATE_MAX = base_data['Order_Date'].min(), base_data['Order_Date'].max()
+AGE_MIN, AGE_MAX = DA_data['Age'].min(), DA_data['Age'].max()
+AGE_MARKS = {i: {'label': str(i), 'style': {'color': COLOR_SCHEME['text'], 'fontSize': '14px'}}
+             for i in range(int(AGE_MIN), int(AGE_MAX) + 1, 5)}
+
+# Overview key metrics, computed once from the loaded frames
+TOTAL_REVENUE = base_data['Amount'].to_numpy().sum()
+AVG_TRANSACTION_VALUE = base_data['Amount'].to_numpy().mean()
+TOTAL_STUDENTS = base_data['Student_id'].nunique()
+TOTAL_TEACHERS = TP_data['Teacher_ID'].nunique()
+KEY_METRICS = [
+    ("Total Revenue", f"${TOTAL_REVENUE:,.2f}"),
+    ("Total Students", f"{TOTAL_STUDENTS:,}"),
+    ("Total Teachers", f"{TOTAL_TEACHERS:,}"),
+    ("Avg Transaction Value", f"${AVG_TRANSACTION_VALUE:,.2f}")
+]
+
+def metric_card(title, value):
+    """Key metric card of the Glimpse tab"""
+    return html.Div([
+        html.H3(title, style={
+            'fontSize': '20px',
+            'color': COLOR_SCHEME['text'],
+            'marginBottom': '8px'
+        }),
+        html.H4(
+            value, 
+            style={
+                'fontSize': '32px',
+                'color': COLOR_SCHEME['primary'],
+                'marginTop': '0'
+            }
+        )
+    ], style=METRIC_CARD_STYLE)
+
+def info_tooltip(target_id, items, icon_style=INFO_ICON_STYLE):
+    """Info icon plus the tooltip listing the given items, shown on hover"""
+    return [
+        html.Span("ⓘ", id=target_id, style=icon_style),
+        dbc.Tooltip(
+            [html.Ul(items)],
+            target=target_id,
+            placement="right",
+            style=TOOLTIP_STYLE
+        )
+    ]
 
-# Update the tab visibility callback
-@app.callback(
-    [Output('glimpse-content', 'style'),
-     Output('overview-content', 'style'),
-     Output('operation-content', 'style'),
-     Output('marketing-content', 'style')],
-    [Input('tabs', 'value')]
-)
-def render_content(tab):
-    if tab == 'glimpse':
-        return {'display': 'block', 'padding': '24px'}, {'display': 'none'}, {'display': 'none'}, {'display': 'none'}
-    elif tab == 'overview':
-        return {'display': 'none'}, {'display': 'block'}, {'display': 'none'}, {'display': 'none'}
-    elif tab == 'operation':
-        return {'display': 'none'}, {'display': 'none'}, {'display': 'block'}, {'display': 'none'}
-    elif tab == 'marketing':
-        return {'display': 'none'}, {'display': 'none'}, {'display': 'none'}, {'display': 'block'}
-    return {'display': 'none'}, {'display': 'none'}, {'display': 'none'}, {'display': 'none'}
-
-
-# Add callbacks for the new overview graphs in Glimpse tab
-@app.callback(
-    Output('overview-revenue-trend', 'figure'),
-    [Input('tabs', 'value')]
-)
-def update_revenue_trend(tab):
-    if tab != 'glimpse':
-        return {}
-    
-    monthly_revenue = base_data.groupby(
-        base_data['Order_Date'].dt.strftime('%Y-%m')
-    )['Amount'].sum().reset_index()
+def glimpse_revenue_trend_figure():
+    """Monthly revenue line of the Glimpse tab"""
+    totals = base_data.groupby('Year_Month')['Amount'].sum()
+    monthly_revenue = pd.DataFrame({
+        'Order_Date': year_month_labels(totals.index),
+        'Amount': totals.values
+    })
     
     fig = go.Figure()
     fig.add_trace(go.Scatter(
@@ -1177,14 +425,8 @@ def update_revenue_trend(tab):
     
     return fig
 
-@app.callback(
-    Output('overview-course-dist', 'figure'),
-    [Input('tabs', 'value')]
-)
-def update_course_dist(tab):
-    if tab != 'glimpse':
-        return {}
-    
+def glimpse_course_dist_figure():
+    """Course type pie of the Glimpse tab"""
     course_dist = base_data['Course_Type_Name'].value_counts()
     
     fig = go.Figure(data=[go.Pie(
@@ -1203,14 +445,8 @@ def update_course_dist(tab):
     
     return fig
 
-@app.callback(
-    Output('overview-gender-dist', 'figure'),
-    [Input('tabs', 'value')]
-)
-def update_gender_dist(tab):
-    if tab != 'glimpse':
-        return {}
-    
+def glimpse_gender_dist_figure():
+    """Gender pie of the Glimpse tab"""
     gender_dist = base_data['Customer_Gender'].value_counts()
     
     fig = go.Figure(data=[go.Pie(
@@ -1229,14 +465,8 @@ def update_gender_dist(tab):
     
     return fig
 
-@app.callback(
-    Output('overview-age-dist', 'figure'),
-    [Input('tabs', 'value')]
-)
-def update_age_dist(tab):
-    if tab != 'glimpse':
-        return {}
-    
+def glimpse_age_dist_figure():
+    """Customer age histogram of the Glimpse tab"""
     fig = go.Figure(data=[go.Histogram(
         x=base_data['Customer_Age'],
         nbinsx=20,
@@ -1254,79 +484,33 @@ def update_age_dist(tab):
     
     return fig
 
-# Callback for Monthly Revenue Chart
-@app.callback(
-    Output('monthly-revenue-chart', 'figure'),
-    [Input('date-range-combined', 'start_date'),
-     Input('date-range-combined', 'end_date'),
-     Input('age-range-demo', 'value'),
-     Input('course-type-combined', 'value'),
-     Input('region-revenue', 'value'),
-     Input('gender-dropdown', 'value')],
-    prevent_initial_call=False
-)
-def update_monthly_revenue(start_date, end_date, age_range, course_types, cities, genders):
-    filtered_df = base_data.copy()
-    
-    if start_date and end_date:
-        filtered_df = filtered_df[
-            (filtered_df['Order_Date'] >= start_date) & 
-            (filtered_df['Order_Date'] <= end_date)
-        ]
-    if age_range:
-        filtered_df = filtered_df[(filtered_df['Customer_Age'] >= age_range[0]) & (filtered_df['Customer_Age'] <= age_range[1])]
-    if course_types:
-        filtered_df = filtered_df[
-            filtered_df['Course_Type_Name'].isin(course_types)
-        ]
-    
-    if cities:
-        filtered_df = filtered_df[
-            filtered_df['City'].isin(cities)
-        ]
-    if genders:
-        filtered_df = filtered_df[filtered_df['Customer_Gender'].isin(genders)]
+# The Glimpse tab has no filters, so its figures are built once at startup
+GLIMPSE_REVENUE_TREND = glimpse_revenue_trend_figure().to_plotly_json()
+GLIMPSE_COURSE_DIST = glimpse_course_dist_figure().to_plotly_json()
+GLIMPSE_GENDER_DIST = glimpse_gender_dist_figure().to_plotly_json()
+GLIMPSE_AGE_DIST = glimpse_age_dist_figure().to_plotly_json()
 
-    # Calculate monthly revenue
-    monthly_revenue = filtered_df.groupby(
-        filtered_df['Order_Date'].dt.strftime('%Y-%m')
-    )['Amount'].sum().reset_index()
+# Check if TP_data loaded successfully
+if TP_data.empty:
+    print("Warning: Teacher performance data is empty")
+else:
+    #print(f"Successfully loaded teacher performance data:")
     
-    # Calculate growth rate
-    monthly_revenue['Growth_Rate'] = monthly_revenue['Amount'].pct_change() * 100
+    try:
+        if 'Total_Teaching_Hours' in TP_data.columns:
+            print(f"- Total teaching hours: {TP_data['Total_Teaching_Hours'].sum():,.0f}")
+        if 'Total_Revenue' in TP_data.columns:
+            print(f"- Total sales revenue: ${TP_data['Total_Revenue'].sum():,.2f}")
+        if 'Years_of_Experience' in TP_data.columns:
+            print(f"- Average years of experience: {TP_data['Years_of_Experience'].mean():.1f}")
+    except Exception as e:
+        print(f"Warning: Some metrics couldn't be calculated - {str(e)}")
+
 
-    # Create figure with secondary y-axis
-    fig = make_subplots(specs=[[{"secondary_y": True}]])
-    # Add revenue bars
-    fig.add_trace(
-        go.Bar(
-            x=monthly_revenue['Order_Date'],
-            y=monthly_revenue['Amount'],
-            name="Monthly Revenue",
-            marker_color=COLOR_SCHEME['secondary']
-        ),
-        secondary_y=False
-    )
-    # Add line chart for monthly growth rate
-    monthly_revenue['Growth_Rate_Label'] = monthly_revenue['Growth_Rate'].apply(
-        lambda x: f"{x:.1f}%"
-    )
-    # Add growth rate line
-    fig.add_trace(
-        go.Scatter(
-            x=monthly_revenue['Order_Date'],
-            y=monthly_revenue['Growth_Rate'],
-            name="Growth Rate (%)",
-            line=dict(color=COLOR_SCHEME['accent']),
-            text=monthly_revenue['Growth_Rate_Label'],
-            textposition='top center',  
-            textfont=dict(color='#024959'), 
-            hovertemplate="Growth Rate: %{text}", 
-            mode='lines+markers+text'
-        ),
-        secondary_y=True
-    )
 
+def monthly_revenue_layout():
+    """Layout shared by the monthly revenue charts (bars plus growth rate on a secondary axis)"""
+    fig = make_subplots(specs=[[{"secondary_y": True}]])
     # Update layout with significantly increased margins and spacing
     fig.update_layout(
         title={
@@ -1391,109 +575,40 @@ def update_monthly_revenue(start_date, end_date, age_range, course_types, cities
         automargin=True,
         ticklabelposition="outside"
     )
+    return fig.layout
 
-    return fig
-
-# Callback for Monthly Revenue Chart
-@app.callback(
-    Output('operation-monthly-revenue-chart', 'figure'),
-    [Input('operation-date-range-combined', 'start_date'),
-     Input('operation-date-range-combined', 'end_date'),
-     Input('operation-age-range-demo', 'value'),
-     Input('operation-course-type-combined', 'value'),
-     Input('operation-region-revenue', 'value'),
-     Input('operation-gender-dropdown', 'value')],
-    prevent_initial_call=False
-)
-def update_monthly_revenue(start_date, end_date, age_range, course_types, cities, genders):
-    filtered_df = base_data.copy()
-    
-    if start_date and end_date:
-        filtered_df = filtered_df[
-            (filtered_df['Order_Date'] >= start_date) & 
-            (filtered_df['Order_Date'] <= end_date)
-        ]
-    if age_range:
-        filtered_df = filtered_df[(filtered_df['Customer_Age'] >= age_range[0]) & (filtered_df['Customer_Age'] <= age_range[1])]
-    if course_types:
-        filtered_df = filtered_df[
-            filtered_df['Course_Type_Name'].isin(course_types)
-        ]
-    
-    if cities:
-        filtered_df = filtered_df[
-            filtered_df['City'].isin(cities)
-        ]
-    if genders:
-        filtered_df = filtered_df[filtered_df['Customer_Gender'].isin(genders)]
-
-    # Calculate monthly revenue
-    monthly_revenue = filtered_df.groupby(
-        filtered_df['Order_Date'].dt.strftime('%Y-%m')
-    )['Amount'].sum().reset_index()
-    
-    # Calculate growth rate
-    monthly_revenue['Growth_Rate'] = monthly_revenue['Amount'].pct_change() * 100
-
-    # Create figure with secondary y-axis
-    fig = make_subplots(specs=[[{"secondary_y": True}]])
-    # Add revenue bars
-    fig.add_trace(
-        go.Bar(
-            x=monthly_revenue['Order_Date'],
-            y=monthly_revenue['Amount'],
-            name="Monthly Revenue",
-            marker_color=COLOR_SCHEME['secondary']
-        ),
-        secondary_y=False
-    )
-    # Add line chart for monthly growth rate
-    monthly_revenue['Growth_Rate_Label'] = monthly_revenue['Growth_Rate'].apply(
-        lambda x: f"{x:.1f}%"
-    )
-    # Add growth rate line
-    fig.add_trace(
-        go.Scatter(
-            x=monthly_revenue['Order_Date'],
-            y=monthly_revenue['Growth_Rate'],
-            name="Growth Rate (%)",
-            line=dict(color=COLOR_SCHEME['accent']),
-            text=monthly_revenue['Growth_Rate_Label'],
-            textposition='top center',  
-            textfont=dict(color='#024959'), 
-            hovertemplate="Growth Rate: %{text}", 
-            mode='lines+markers+text'
-        ),
-        secondary_y=True
+def booking_heatmap_layout(height, top_margin):
+    """Layout of a booking heatmap with the given height and top margin"""
+    fig = px.imshow(
+        pd.DataFrame([[0]]),
+        labels=dict( y="Day of the Week", color="Total Amount"),
+        color_continuous_scale=[
+            [0, "grey"],
+            [0.5, "#ffe5bd"],
+            [1, "#EDB265"]
+        ],
+        zmin=0,
+        zmax=120000,
+        title="Heatmap of Transaction Amount"
     )
-
-    # Update layout with significantly increased margins and spacing
     fig.update_layout(
         title={
-            'text': 'Monthly Revenue Analysis',
+            'text': 'Student Order Timing Analysis',
             'y': 0.98,
             'x': 0.5,
             'xanchor': 'center',
             'yanchor': 'top',
             'font': dict(size=24)
         },
-        height=600,  # 增加圖表高度
+        height=height,  # 增加圖表高度
         margin=dict(
             l=100,   # 增加左邊距
             r=100,   # 增加右邊距
-            t=100,   # 顯著增加上邊距
-            b=150    # 增加下邊距
-        ),
-        legend=dict(
-            orientation="h",
-            yanchor="bottom",
-            y=1.03,  # 將圖例往上移更多
-            xanchor="center",
-            x=0.5,
-            font=dict(size=20),
-            itemsizing='constant'
+            t=top_margin,   # 顯著增加上邊距
+            b=100    # 增加下邊距
         ),
         xaxis=dict(
+            title=None,
             tickangle=45,
             tickfont=dict(size=18),
             titlefont=dict(size=20),
@@ -1505,1010 +620,786 @@ def update_monthly_revenue(start_date, end_date, age_range, course_types, cities
             tickfont=dict(size=18),
             titlefont=dict(size=20),
             title_standoff=30,
-            title_text="Revenue",
-            rangemode='tozero'
-        ),
-        yaxis2=dict(
-            tickfont=dict(size=18),
-            titlefont=dict(size=20),
-            title_standoff=30,
-            title_text="Growth Rate (%)",
+            title_text='Day of Week',
             rangemode='tozero'
-        ),
-        showlegend=True,
-        plot_bgcolor='white',
-        bargap=0.2,  # 調整條形圖間距
+        )
     )
+    return fig.layout
+
+# Figure layouts are built once and set on the graphs; callbacks only patch in the traces
+MONTHLY_LAYOUT = monthly_revenue_layout()
+OVERVIEW_BOOKING, MARKETING_BOOKING = 'overview', 'marketing'
+BOOKING_LAYOUTS = {
+    OVERVIEW_BOOKING: booking_heatmap_layout(height=600, top_margin=150),
+    MARKETING_BOOKING: booking_heatmap_layout(height=500, top_margin=100)
+}
+# Initial (trace-less) figures as plain dicts, so building a tab validates no figures
+MONTHLY_EMPTY_FIGURE = go.Figure(layout=MONTHLY_LAYOUT).to_plotly_json()
+BOOKING_EMPTY_FIGURES = {
+    variant: go.Figure(layout=layout).to_plotly_json()
+    for variant, layout in BOOKING_LAYOUTS.items()
+}
 
-    # 確保圖表區域有足夠空間
-    fig.update_yaxes(
-        secondary_y=False,
-        automargin=True,  # 自動調整邊距
-        ticklabelposition="outside"  # 將刻度標籤放在軸外側
-    )
-    fig.update_yaxes(
-        secondary_y=True,
-        automargin=True,
-        ticklabelposition="outside"
-    )
+# Initialize the Dash app; callback payloads (large figure JSON) are gzipped by flask-compress.
+# Tab contents are built on demand, so callbacks may target components not in the initial layout.
+app = Dash(__name__, compress=True, suppress_callback_exceptions=True)
 
-    return fig
+server = app.server
 
+# Memoize filtered aggregations so repeated filter combinations skip the pandas work.
+# With CACHE_REDIS_URL set the entries are shared by all gunicorn workers,
+# otherwise each worker keeps its own in-memory cache.
+if os.environ.get('CACHE_REDIS_URL'):
+    CACHE_CONFIG = {'CACHE_TYPE': 'RedisCache', 'CACHE_REDIS_URL': os.environ['CACHE_REDIS_URL']}
+else:
+    CACHE_CONFIG = {'CACHE_TYPE': 'SimpleCache'}
+cache = Cache(server, config={**CACHE_CONFIG, 'CACHE_DEFAULT_TIMEOUT': 600})
 
+def build_glimpse():
+    """Glimpse tab: key metrics and the static overview charts"""
+    return html.Div([
+        html.H2("Overview Dashboard", style=TEXT_STYLES['section_header']),
 
-# Callback for Booking Heatmap
-@app.callback(
-    Output('booking-heatmap', 'figure'),
-    [Input('date-range-combined', 'start_date'),
-     Input('date-range-combined', 'end_date'),
-     Input('age-range-demo', 'value'),
-     Input('course-type-combined', 'value'),
-     Input('region-revenue', 'value'),
-     Input('gender-dropdown', 'value')],
-    prevent_initial_call=False
-)
-def update_booking_heatmap(start_date, end_date, age_range, course_types, cities, genders):
-    filtered_df = base_data.copy()
-    
-    # Apply filters
-    if start_date and end_date:
-        filtered_df = filtered_df[(filtered_df['Order_Date'] >= start_date) & (filtered_df['Order_Date'] <= end_date)]
-    if age_range:
-        filtered_df = filtered_df[(filtered_df['Customer_Age'] >= age_range[0]) & (filtered_df['Customer_Age'] <= age_range[1])]
-    if course_types:
-        filtered_df = filtered_df[filtered_df['Course_Type_Name'].isin(course_types)]
-    if cities:
-        filtered_df = filtered_df[filtered_df['City'].isin(cities)]
-    if genders:
-        filtered_df = filtered_df[filtered_df['Customer_Gender'].isin(genders)]
-
-    # Add day and month columns
-    filtered_df['Day_of_Week'] = filtered_df['Order_Date'].dt.day_name()
-    filtered_df['Month'] = filtered_df['Order_Date'].dt.strftime('%Y-%m')
-
-    # Group data for heatmap
-    heatmap_data = filtered_df.groupby(['Day_of_Week', 'Month'])['Amount'].sum().reset_index()
-
-    # Define the correct order for days and months
-    days_order = ['Monday', 'Tuesday', 'Wednesday', 'Thursday', 'Friday', 'Saturday', 'Sunday']
-    #months_order = [
-    #    'January', 'February', 'March', 'April', 'May', 'June',
-    #    'July', 'August', 'September', 'October', 'November', 'December'
-    #]
-
-    # Ensure correct ordering and add missing combinations
-    all_combinations = pd.DataFrame(list(itertools.product(days_order)), columns=['Day_of_Week'])
-    heatmap_data = all_combinations.merge(heatmap_data, on=['Day_of_Week'], how='left').fillna(0)
-
-    # Pivot the data for the heatmap
-    heatmap_pivot = heatmap_data.pivot(index='Day_of_Week', columns='Month', values='Amount').fillna(0)
-
-    # Reindex rows and columns explicitly
-    heatmap_pivot = heatmap_pivot.reindex(index=days_order)
-
-    # Create heatmap
-    fig = px.imshow(
-        heatmap_pivot,
-        labels=dict( y="Day of the Week", color="Total Amount"),
-        y=days_order,
-        color_continuous_scale=[
-            [0, "grey"],
-            [0.5, "#ffe5bd"],
-            [1, "#EDB265"]
-        ],
-        zmin=0,
-        zmax=120000,
-        title="Heatmap of Transaction Amount"
-    )
-    fig.update_layout(
-        title={
-            'text': 'Student Order Timing Analysis',
-            'y': 0.98,
-            'x': 0.5,
-            'xanchor': 'center',
-            'yanchor': 'top',
-            'font': dict(size=24)
-        },
-        height=600,  # 增加圖表高度
-        margin=dict(
-            l=100,   # 增加左邊距
-            r=100,   # 增加右邊距
-            t=150,   # 顯著增加上邊距
-            b=100    # 增加下邊距
-        ),
-        xaxis=dict(
-            title=None,
-            tickangle=45,
-            tickfont=dict(size=18),
-            titlefont=dict(size=20),
-            title_standoff=30,  # 增加軸標題與圖表的距離
-            dtick="M1",  # 設置月份間隔
-            tickformat="%b"  # 格式化日期顯示
-        ),
-        yaxis=dict(
-            tickfont=dict(size=18),
-            titlefont=dict(size=20),
-            title_standoff=30,
-            title_text='Day of Week',
-            rangemode='tozero'
-        )
-    )
-
-    return fig
-
-# Callback for Booking Heatmap
-@app.callback(
-    Output('marketing-booking-heatmap', 'figure'),
-    [Input('marketing-date-range-combined', 'start_date'),
-     Input('marketing-date-range-combined', 'end_date'),
-     Input('marketing-age-range-demo', 'value'),
-     Input('marketing-course-type-combined', 'value'),
-     Input('marketing-region-revenue', 'value'),
-     Input('marketing-gender-dropdown', 'value')],
-    prevent_initial_call=False
-)
-def update_booking_heatmap(start_date, end_date, age_range, course_types, cities, genders):
-    filtered_df = base_data.copy()
-    
-    # Apply filters
-    if start_date and end_date:
-        filtered_df = filtered_df[(filtered_df['Order_Date'] >= start_date) & (filtered_df['Order_Date'] <= end_date)]
-    if age_range:
-        filtered_df = filtered_df[(filtered_df['Customer_Age'] >= age_range[0]) & (filtered_df['Customer_Age'] <= age_range[1])]
-    if course_types:
-        filtered_df = filtered_df[filtered_df['Course_Type_Name'].isin(course_types)]
-    if cities:
-        filtered_df = filtered_df[filtered_df['City'].isin(cities)]
-    if genders:
-        filtered_df = filtered_df[filtered_df['Customer_Gender'].isin(genders)]
-
-    # Add day and month columns
-    filtered_df['Day_of_Week'] = filtered_df['Order_Date'].dt.day_name()
-    filtered_df['Month'] = filtered_df['Order_Date'].dt.strftime('%Y-%m')
-
-    # Group data for heatmap
-    heatmap_data = filtered_df.groupby(['Day_of_Week', 'Month'])['Amount'].sum().reset_index()
-
-    # Define the correct order for days and months
-    days_order = ['Monday', 'Tuesday', 'Wednesday', 'Thursday', 'Friday', 'Saturday', 'Sunday']
-    #months_order = [
-    #    'January', 'February', 'March', 'April', 'May', 'June',
-    #    'July', 'August', 'September', 'October', 'November', 'December'
-    #]
-
-    # Ensure correct ordering and add missing combinations
-    all_combinations = pd.DataFrame(list(itertools.product(days_order)), columns=['Day_of_Week'])
-    heatmap_data = all_combinations.merge(heatmap_data, on=['Day_of_Week'], how='left').fillna(0)
-
-    # Pivot the data for the heatmap
-    heatmap_pivot = heatmap_data.pivot(index='Day_of_Week', columns='Month', values='Amount').fillna(0)
-
-    # Reindex rows and columns explicitly
-    heatmap_pivot = heatmap_pivot.reindex(index=days_order)
-
-    # Create heatmap
-    fig = px.imshow(
-        heatmap_pivot,
-        labels=dict( y="Day of the Week", color="Total Amount"),
-        y=days_order,
-        color_continuous_scale=[
-            [0, "grey"],
-            [0.5, "#ffe5bd"],
-            [1, "#EDB265"]
-        ],
-        zmin=0,
-        zmax=120000,
-        title="Heatmap of Transaction Amount"
-    )
-    fig.update_layout(
-        title={
-            'text': 'Student Order Timing Analysis',
-            'y': 0.98,
-            'x': 0.5,
-            'xanchor': 'center',
-            'yanchor': 'top',
-            'font': dict(size=24)
-        },
-        height=500,  # 增加圖表高度
-        margin=dict(
-            l=100,   # 增加左邊距
-            r=100,   # 增加右邊距
-            t=100,   # 顯著增加上邊距
-            b=100    # 增加下邊距
-        ),
-        xaxis=dict(
-            title=None,
-            tickangle=45,
-            tickfont=dict(size=18),
-            titlefont=dict(size=20),
-            title_standoff=30,  # 增加軸標題與圖表的距離
-            dtick="M1",  # 設置月份間隔
-            tickformat="%b"  # 格式化日期顯示
-        ),
-        yaxis=dict(
-            tickfont=dict(size=18),
-            titlefont=dict(size=20),
-            title_standoff=30,
-            title_text='Day of Week',
-            rangemode='tozero'
-        )
-    )
-
-    return fig
-
-
-# Callback for Demographics Chart
-@app.callback(
-    Output('demographics-chart', 'figure'),
-    [Input('date-range-combined', 'start_date'),
-     Input('date-range-combined', 'end_date'),
-     Input('age-range-demo', 'value'),
-     Input('course-type-combined', 'value'),
-     Input('region-revenue', 'value'),
-     Input('btn-gender', 'n_clicks'),
-     Input('btn-age', 'n_clicks'),
-     Input('btn-course', 'n_clicks'),
-     Input('btn-region', 'n_clicks'),
-     Input('btn-age-course', 'n_clicks')],
-    prevent_initial_call=False
-)
-def update_demographics(start_date, end_date, age_range, course_types, cities,
-                       n_gender, n_age, n_course, n_region, n_age_course):
-    # Initialize empty figure
-    fig = go.Figure()
-
-    # Get the button that triggered the callback
-    button_id = ctx.triggered_id if ctx.triggered else 'btn-gender'
-
-    # Initial filtering
-    filtered_transactions = base_data.copy()
-    if start_date and end_date:
-        filtered_transactions = filtered_transactions[
-            (filtered_transactions['Order_Date'] >= start_date) & 
-            (filtered_transactions['Order_Date'] <= end_date)
-        ]
-
-    relevant_students = filtered_transactions['Student_id'].unique()
-    filtered_df = DA_data[DA_data['StudentID'].isin(relevant_students)].copy()
-
-    if age_range:
-        filtered_df = filtered_df[
-            (filtered_df['Age'] >= age_range[0]) & 
-            (filtered_df['Age'] <= age_range[1])
-        ]
-    
-    if course_types:
-        filtered_df = filtered_df[filtered_df['Course_Type_Name'].isin(course_types)]
-    
-    if cities:
-        filtered_df = filtered_df[filtered_df['City'].isin(cities)]
-
-    # Check if filtered data is empty
-    if len(filtered_df) == 0:
-        fig.add_annotation(
-            text="No data available for the selected filters",
-            xref="paper",
-            yref="paper",
-            x=0.5,
-            y=0.5,
-            showarrow=False,
-            font=dict(size=28, color=COLOR_SCHEME['text'])
-        )
-        return fig
-
-    # Create visualizations based on button clicked
-    if button_id == 'btn-gender':
-        gender_dist = filtered_df['Gender'].value_counts()
-        colors = [COLOR_SCHEME['secondary'], COLOR_SCHEME['accent']]
-        fig = go.Figure(data=[go.Pie(
-            labels=gender_dist.index,
-            values=gender_dist.values,
-            hole=0.3,
-            textinfo='label+percent',
-            textposition='outside',
-            marker_colors=colors
-        )])
-        fig.update_layout(
-            title=dict(
-                text='Gender Distribution by Selected Region',
-                y=0.95,
-                x=0.5,
-                xanchor='center',
-                yanchor='top'
-            ),
-            title_font_size=24,
-            legend=dict(
-                font=dict(size=20)
-            ),
-            uniformtext=dict(
-                mode='hide',
-                minsize=18
-            )
-        )
-
-    elif button_id == 'btn-age':
-        fig = go.Figure(data=[go.Histogram(
-            x=filtered_df['Age'],
-            nbinsx=20,
-            name='Age Distribution',
-            marker_color=COLOR_SCHEME['secondary']
-        )])
-        fig.update_layout(
-            title='Age Distribution by Selected Region',
-            xaxis_title='Age',
-            yaxis_title='Count'
-        )
-
-    elif button_id == 'btn-course':
-        course_dist = filtered_df['Course_Type_Name'].value_counts()
-        fig = go.Figure(data=[go.Bar(
-            x=course_dist.index,
-            y=course_dist.values,
-            text=course_dist.values,
-            textposition='auto',
-            marker_color=COLOR_SCHEME['secondary'],
-            name='Course Distribution',
-            hovertemplate="Course: %{x}<br>Count: %{y}<extra></extra>"
-        )])
-        fig.update_layout(
-            title='Course Type Distribution by Selected Region',
-            xaxis_title='Course Type',
-            yaxis_title='Count',
-            xaxis={'tickangle': 45},
-            #showlegend=False
-        )
-
-    elif button_id == 'btn-region':
-        # Get region distribution for bars
-        region_dist = filtered_df['Learning Area'].value_counts().sort_values(ascending=False)
-        n_regions = len(region_dist)
-        
-        # Get unique cities for legend
-        cities = filtered_df['City'].unique()
-        n_cities = len(cities)
-        
-        # Generate colors
-        colors = px.colors.sequential.Oranges[2:]
-        region_colors = colors[:n_regions] if n_regions <= len(colors) else colors * (n_regions // len(colors) + 1)
-        
-        # Create the bar chart with regions
-        fig = go.Figure(data=[go.Bar(
-            x=region_dist.index,
-            y=region_dist.values,
-            text=region_dist.values,
-            textposition='auto',
-            marker_color=region_colors,
-            showlegend=False,  # Hide the region legend
-            hovertemplate="Region: %{x}<br>Count: %{y}<extra></extra>"
-        )])
-        
-        # Add invisible scatter traces for city legend
-        for idx, city in enumerate(cities):
-            fig.add_trace(go.Scatter(
-                x=[None],
-                y=[None],
-                mode='markers',
-                marker=dict(color=region_colors[idx]),
-                name=city,
-                showlegend=True
-            ))
-        
-        fig.update_layout(
-            title='Region Distribution (Sorted by Count)',
-            xaxis_title='Region',
-            yaxis_title='Count',
-            xaxis={'tickangle': 45},
-            showlegend=True,
-            legend=dict(
-                font=dict(
-                    family='"Segoe UI", Arial, sans-serif',
-                    size=28,  # 增加圖例字體大小
-                    color=COLOR_SCHEME['text']
-                ),
-                orientation="h",
-                yanchor="bottom",
-                y=1.02,
-                xanchor="right",
-                x=1
-            )
-        )
-
-    elif button_id == 'btn-age-course':
-        # Create age-course distribution
-        age_course_dist = filtered_df.groupby(['Age', 'Course_Type_Name']).size().unstack(fill_value=0)
-        
-        fig = go.Figure()
-        colors = px.colors.qualitative.Set3
-        
-        for idx, course in enumerate(age_course_dist.columns):
-            color = colors[idx % len(colors)]
-            fig.add_trace(
-                go.Scatter(
-                    x=age_course_dist.index,
-                    y=age_course_dist[course],
-                    name=course,
-                    mode='lines',
-                    stackgroup='one',
-                    line=dict(width=0.5),
-                    hovertemplate=(
-                        "Age: %{x}<br>" +
-                        "Count: %{y}<br>" +
-                        "<extra></extra>"
-                    )
-                )
-            )
-        
-        fig.update_layout(
-            title='Age Distribution by Course Type in Selected Region',
-            xaxis_title='Age',
-            yaxis_title='Count',
-            hovermode='x unified'
-        )
-
-    # Apply common styling
-    fig.update_layout(
-        plot_bgcolor='white',
-        paper_bgcolor='white',
-        font=dict(color=COLOR_SCHEME['text']),
-        title_x=0.5,
-        title_font=dict(size=24),
-        showlegend=True,
-        legend=dict(
-            orientation="h",
-            yanchor="bottom",
-            y=1.02,
-            xanchor="right",
-            x=1
-        )
-    )
-
-    return fig
-# Update the chart styling function with larger fonts
-def update_chart_layout(fig):
-    fig.update_layout(
-        template='plotly_white',
-        paper_bgcolor='rgba(0,0,0,0)',
-        plot_bgcolor='rgba(0,0,0,0)',
-        font={
-            'family': '"Segoe UI", Arial, sans-serif',
-            'color': COLOR_SCHEME['text'],
-            'size': 28
-        },
-        title_font={
-            'family': '"Segoe UI", Arial, sans-serif',
-            'color': COLOR_SCHEME['primary'],
-            'size': 40
-        },
-        legend_title_font={
-            'family': '"Segoe UI", Arial, sans-serif',
-            'color': COLOR_SCHEME['primary']
-        },
-        hoverlabel={'font': {'size': 28}},
-        margin=dict(t=50, l=50, r=50, b=50)
-    )
-    return fig
+        # Key Metrics Row
+        html.Div([metric_card(title, value) for title, value in KEY_METRICS],
+                 style={'display': 'flex', 'gap': '24px', 'marginBottom': '24px'}),
 
-# Callback for Demographics Chart
-@app.callback(
-    Output('marketing-demographics-chart', 'figure'),
-    [Input('marketing-date-range-combined', 'start_date'),
-     Input('marketing-date-range-combined', 'end_date'),
-     Input('marketing-age-range-demo', 'value'),
-     Input('marketing-course-type-combined', 'value'),
-     Input('marketing-region-revenue', 'value'),
-     Input('marketing-btn-gender', 'n_clicks'),
-     Input('marketing-btn-age', 'n_clicks'),
-     Input('marketing-btn-course', 'n_clicks'),
-     Input('marketing-btn-region', 'n_clicks'),
-     Input('marketing-btn-age-course', 'n_clicks')],
-    prevent_initial_call=False
-)
-def update_demographics(start_date, end_date, age_range, course_types, cities,
-                       n_gender, n_age, n_course, n_region, n_age_course):
-    # Initialize empty figure
-    fig = go.Figure()
+        # Charts Row
+        html.Div([
+            # Revenue Trend
+            html.Div([
+                dcc.Graph(id='overview-revenue-trend', figure=GLIMPSE_REVENUE_TREND)
+            ], style=CHART_CARD_STYLE),
 
-    # Get the button that triggered the callback
-    button_id = ctx.triggered_id if ctx.triggered else 'marketing-btn-gender'
+            # Course Distribution
+            html.Div([
+                dcc.Graph(id='overview-course-dist', figure=GLIMPSE_COURSE_DIST)
+            ], style=CHART_CARD_STYLE)
+        ], style={'display': 'flex', 'gap': '24px', 'marginBottom': '24px'}),
 
-    # Initial filtering
-    filtered_transactions = base_data.copy()
-    if start_date and end_date:
-        filtered_transactions = filtered_transactions[
-            (filtered_transactions['Order_Date'] >= start_date) & 
-            (filtered_transactions['Order_Date'] <= end_date)
-        ]
+        # Bottom Charts Row
+        html.Div([
+            # Gender Distribution
+            html.Div([
+                dcc.Graph(id='overview-gender-dist', figure=GLIMPSE_GENDER_DIST)
+            ], style=CHART_CARD_STYLE),
 
-    relevant_students = filtered_transactions['Student_id'].unique()
-    filtered_df = DA_data[DA_data['StudentID'].isin(relevant_students)].copy()
+            # Age Distribution
+            html.Div([
+                dcc.Graph(id='overview-age-dist', figure=GLIMPSE_AGE_DIST)
+            ], style=CHART_CARD_STYLE)
+        ], style={'display': 'flex', 'gap': '24px'})
+    ], id='glimpse-content', style={'padding': '24px'})
+
+def build_overview():
+    """Overview tab: revenue, teacher and demographic charts"""
+    return html.Div([
+        # Revenue & Booking Analysis Section
+        html.Div([
+            html.H2("Revenue & Booking Analysis", style=TEXT_STYLES['section_header']),
+            html.Div([
+                html.Div([
+                    dcc.Graph(
+                        id='monthly-revenue-chart', 
+                        figure=MONTHLY_EMPTY_FIGURE,
+                        style=GRAPH_STYLE
+                    ),
+                    *info_tooltip("info-icon-monthly-revenue-chart", [
+                        html.Li("Users: Operating Officers, Finance Team"),
+                        html.Li("Purpose: Monitor revenue and growth trends to guide resource allocation and planning."),
+                        html.Li("Chart: Combination (Bar + Line)"),
+                        html.Ul([
+                            html.Li("Bar Chart: X = Months, Y = Monthly Revenue"),
+                            html.Li("Line Chart: Y = Growth Rate (%)")
+                        ]),
+                        html.Li("Insights:"),
+                        html.Ul([
+                            html.Li("Identify peak revenue months and contributing factors."),
+                            html.Li("Track trends in revenue growth or decline."),
+                            html.Li("Assess effectiveness of campaigns and seasonal strategies.")
+                        ])
+                    ])
+                ], style=CHART_LEFT_STYLE),
+                html.Div([
+                    dcc.Graph(
+                        id='booking-heatmap', 
+                        figure=BOOKING_EMPTY_FIGURES[OVERVIEW_BOOKING],
+                        style=GRAPH_STYLE
+                    ),
+                    *info_tooltip("info-icon-booking-heatmap", [
+                        html.Li("Users: Marketing, Customer Support Teams"),
+                        html.Li("Purpose: Analyze student order patterns over time."),
+                        html.Li("Chart: Heatmap"),
+                        html.Ul([
+                            html.Li("X-Axis: Months (January to December)."),
+                            html.Li("Y-Axis: Days of the week (Monday to Sunday)."),
+                            html.Li("Color Scale: Represents the volume of orders placed.")
+                        ]),
+                        html.Li("Insights:"),
+                        html.Ul([
+                            html.Li("Detect peak days and months for student purchases."),
+                            html.Li("Align marketing efforts and promotions with high-order periods."),
+                            html.Li("Adjust operational resources to cater to peak demand times, ensuring seamless service.")
+                        ])
+                    ])
+
+                ], style=CHART_RIGHT_STYLE)
+            ], style=CHART_ROW_STYLE)
+        ], style=CARD_STYLE),
+
+        # Teacher Performance Analysis Section
+        html.Div([
+            html.H2("Teacher Performance Analysis", style=TEXT_STYLES['section_header']),
+            html.Div([
+                html.Div([
+                    dcc.Graph(
+                        id='teacher-class-trend', 
+                        style=GRAPH_STYLE
+                    ),
+                    *info_tooltip("info-icon-teacher-class-trend", [
+                        html.Li("Users: Operating Officers, Finance Team"),
+                        html.Li("Purpose: Analyze top 5 teachers' sales and monthly distribution for better planning."),
+                        html.Li("Chart: Stacked Bar (X: Teacher names, Y: Courses sold, Monthly data)"),
+                        html.Li("Insights:"),
+                        html.Ul([
+                            html.Li("Highlight top-performing teachers."),
+                            html.Li("Understand sales seasonality."),
+                            html.Li("Identify areas for support or incentives.")
+                        ])
+                    ])
+                ], style=CHART_LEFT_STYLE),
+                html.Div([
+                    dcc.Graph(
+                        id='teacher-student-heatmap', 
+                        style=GRAPH_STYLE
+                    ),
+                    *info_tooltip("info-icon-teacher-student-heatmap", [
+                        html.Li("Users: Marketing, Customer Support Teams"),
+                        html.Li("Purpose: Analyze age distribution of students for top 5 teachers."),
+                        html.Li("Chart: Heatmap"),
+                        html.Ul([
+                            html.Li("X-Axis: Age groups (0-20, 21-30, 31-40, 41-50, 50+)"),
+                            html.Li("Y-Axis: Top 5 teachers"),
+                            html.Li("Color Scale: Unique students per age group")
+                        ]),
+                        html.Li("Insights:"),
+                        html.Ul([
+                            html.Li("Identify primary audience age groups for each teacher."),
+                            html.Li("Highlight underserved age demographics."),
+                            html.Li("Support tailored course design and learning experiences.")
+                        ])
+                    ]),                                   
+                ], style=CHART_RIGHT_STYLE)
+            ], style=CHART_ROW_STYLE)
+        ], style=CARD_STYLE),
+
+        # Student Demographic Analysis Section
+        html.Div([
+            html.H2("Student Demographic Analysis", style=TEXT_STYLES['section_header']),
+            html.Div([
+                html.Button('Gender Distribution', id='btn-gender', n_clicks=0, style=BUTTON_STYLE),
+                html.Button('Age Distribution', id='btn-age', n_clicks=0, style=BUTTON_STYLE),
+                html.Button('Course Distribution', id='btn-course', n_clicks=0, style=BUTTON_STYLE),
+                html.Button('Region Distribution', id='btn-region', n_clicks=0, style=BUTTON_STYLE),
+                html.Button('Age by Course Type', id='btn-age-course', n_clicks=0, style=BUTTON_STYLE)
+            ], style=BUTTON_ROW_STYLE),
+            # Figures for every button view, refreshed when the filters change
+            dcc.Store(id='demographics-figures'),
+            html.Div([
+                html.Div([
+                    dcc.Graph(
+                        id='demographics-chart', 
+                        style=GRAPH_STYLE
+                    ),
+                    *info_tooltip("info-icon-demographics-chart", [
+                        html.Li("Users: Marketing, Customer Support Teams"),
+                        html.Li("Purpose: Understand student demographics (gender, age, region) for personalized service and growth."),
+                        html.Li("Chart Details:"),
+                        html.Ul([
+                            html.Li("Pie Chart: Gender distribution (Male, Female)"),
+                            html.Li("Histogram: X = Age groups, Y = Number of students"),
+                            html.Li("Bar Chart: X = Geographic regions, Y = Students per region"),
+                            html.Li("Interactive: Demographic filters with buttons")
+                        ]),
+                        html.Li("Insights:"),
+                        html.Ul([
+                            html.Li("Understand gender and age composition for marketing and course customization."),
+                            html.Li("Identify regions with high/low student participation."),
+                            html.Li("Support regional and demographic-specific outreach.")
+                        ])
+                    ], icon_style=DEMOGRAPHICS_INFO_ICON_STYLE),
+                ], style={"position": "relative", "width": "100%", "display": "inline-block"})
+            ], style={'textAlign': 'left', 'marginBottom': '24px'})
+        ], style=CARD_STYLE)
+    ], id='overview-content')
+
+def build_operation():
+    """Operation & Finance tab: revenue and teacher trend charts"""
+    return html.Div([
+        # ... existing operation content ...
+        # Revenue & Booking Analysis Section
+        html.Div([
+            html.H2("Revenue & Booking Analysis", style=TEXT_STYLES['section_header']),
+                html.Div([
+                    dcc.Graph(
+                        id='operation-monthly-revenue-chart',
+                        figure=MONTHLY_EMPTY_FIGURE,
+                        style=GRAPH_STYLE
+                    ),
+                    *info_tooltip("info-icon-operation-monthly-revenue-chart", [
+                        html.Li("Users: Operating Officers, Finance Team"),
+                        html.Li("Purpose: Monitor revenue and growth trends to guide resource allocation and planning."),
+                        html.Li("Chart: Combination (Bar + Line)"),
+                        html.Ul([
+                            html.Li("Bar Chart: X = Months, Y = Monthly Revenue"),
+                            html.Li("Line Chart: Y = Growth Rate (%)")
+                        ]),
+                        html.Li("Insights:"),
+                        html.Ul([
+                            html.Li("Identify peak revenue months and contributing factors."),
+                            html.Li("Track trends in revenue growth or decline."),
+                            html.Li("Assess effectiveness of campaigns and seasonal strategies.")
+                        ])
+                    ])
+
+                 ], style=CHART_LEFT_STYLE),
+                html.Div([
+                    dcc.Graph(
+                        id='operation-teacher-class-trend', 
+                        style={'width': '100%', 'display': 'inline-block', 'marginRight': '2%'}
+                    ),
+                    *info_tooltip("info-icon-operation-teacher-class-trend", [
+                        html.Li("Users: Operating Officers, Finance Team"),
+                        html.Li("Purpose: Analyze top 5 teachers' sales and monthly distribution for better planning."),
+                        html.Li("Chart: Stacked Bar (X: Teacher names, Y: Courses sold, Monthly data)"),
+                        html.Li("Insights:"),
+                        html.Ul([
+                            html.Li("Highlight top-performing teachers."),
+                            html.Li("Understand sales seasonality."),
+                            html.Li("Identify areas for support or incentives.")
+                        ])
+                    ])
+                ], style=CHART_RIGHT_STYLE)
+        ], style=CARD_STYLE),
+    ], id='operation-content')
+
+def build_marketing():
+    """Marketing tab: booking, teacher and demographic charts"""
+    return html.Div([
+        # ... existing operation content ...
+        # Student Booking Time and Recommend Teacher Analysis
+        html.Div([
+            html.H2(
+                "Student Booking Time and Recommend Teacher Analysis", 
+                style=TEXT_STYLES['section_header']
+            ),
+            html.Div([
+                html.Div([
+                    dcc.Graph(
+                        id='marketing-booking-heatmap', 
+                        figure=BOOKING_EMPTY_FIGURES[MARKETING_BOOKING],
+                        style=GRAPH_STYLE
+                    ),
+                    *info_tooltip("info-icon-marketing-booking-heatmap", [
+                        html.Li("Users: Marketing, Customer Support Teams"),
+                        html.Li("Purpose: Analyze student order patterns over time."),
+                        html.Li("Chart: Heatmap"),
+                        html.Ul([
+                            html.Li("X-Axis: Months (January to December)."),
+                            html.Li("Y-Axis: Days of the week (Monday to Sunday)."),
+                            html.Li("Color Scale: Represents the volume of orders placed.")
+                        ]),
+                        html.Li("Insights:"),
+                        html.Ul([
+                            html.Li("Detect peak days and months for student purchases."),
+                            html.Li("Align marketing efforts and promotions with high-order periods."),
+                            html.Li("Adjust operational resources to cater to peak demand times, ensuring seamless service.")
+                        ])
+                    ])
+                ], style=CHART_LEFT_STYLE),
+
+                html.Div([
+                    dcc.Graph(
+                        id='marketing-teacher-student-heatmap', 
+                        style=GRAPH_STYLE
+                    ),
+                    *info_tooltip("info-icon-marketing-teacher-student-heatmap", [
+                        html.Li("Users: Marketing, Customer Support Teams"),
+                        html.Li("Purpose: Analyze age distribution of students for top 5 teachers."),
+                        html.Li("Chart: Heatmap"),
+                        html.Ul([
+                            html.Li("X-Axis: Age groups (0-20, 21-30, 31-40, 41-50, 50+)"),
+                            html.Li("Y-Axis: Top 5 teachers"),
+                            html.Li("Color Scale: Unique students per age group")
+                        ]),
+                        html.Li("Insights:"),
+                        html.Ul([
+                            html.Li("Identify primary audience age groups for each teacher."),
+                            html.Li("Highlight underserved age demographics."),
+                            html.Li("Support tailored course design and learning experiences.")
+                        ])
+                    ]),                                   
+                ], style=CHART_LEFT_STYLE),
+            ], style=CHART_ROW_STYLE)
+        ], style=CARD_STYLE),
+
+        # Demographics Section (now after Teacher Performance)
+        html.Div([
+            html.H2("Student Demographic Analysis", 
+                    style=TEXT_STYLES['section_header']),
+            html.Div([
+                html.Button('Gender Distribution', id='marketing-btn-gender', n_clicks=0, style=BUTTON_STYLE),
+                html.Button('Age Distribution', id='marketing-btn-age', n_clicks=0, style=BUTTON_STYLE),
+                html.Button('Course Distribution', id='marketing-btn-course', n_clicks=0, style=BUTTON_STYLE),
+                html.Button('Region Distribution', id='marketing-btn-region', n_clicks=0, style=BUTTON_STYLE),
+                html.Button('Age by Course Type', id='marketing-btn-age-course', n_clicks=0, style=BUTTON_STYLE)
+            ], style=BUTTON_ROW_STYLE),
+            # Figures for every button view, refreshed when the filters change
+            dcc.Store(id='marketing-demographics-figures'),
+            dcc.Graph(id='marketing-demographics-chart', style=GRAPH_STYLE),
+            *info_tooltip("info-icon-marketing-demographics-chart", [
+                html.Li("Users: Marketing, Customer Support Teams"),
+                html.Li("Purpose: Understand student demographics (gender, age, region) for personalized service and growth."),
+                html.Li("Chart Details:"),
+                html.Ul([
+                    html.Li("Pie Chart: Gender distribution (Male, Female)"),
+                    html.Li("Histogram: X = Age groups, Y = Number of students"),
+                    html.Li("Bar Chart: X = Geographic regions, Y = Students per region"),
+                    html.Li("Interactive: Demographic filters with buttons")
+                ]),
+                html.Li("Insights:"),
+                html.Ul([
+                    html.Li("Understand gender and age composition for marketing and course customization."),
+                    html.Li("Identify regions with high/low student participation."),
+                    html.Li("Support regional and demographic-specific outreach.")
+                ])
+            ]),
+        ], style=CARD_STYLE)
+    ], id='marketing-content')
+
+# Only the selected tab's components are built and sent to the browser
+TAB_BUILDERS = {
+    'glimpse': build_glimpse,
+    'overview': build_overview,
+    'operation': build_operation,
+    'marketing': build_marketing
+}
 
-    if age_range:
-        filtered_df = filtered_df[
-            (filtered_df['Age'] >= age_range[0]) & 
-            (filtered_df['Age'] <= age_range[1])
-        ]
-    
-    if course_types:
-        filtered_df = filtered_df[filtered_df['Course_Type_Name'].isin(course_types)]
+# Update the layout with new text styles
+app.layout = html.Div([
+    # Header section (stays outside tabs)
+    html.Div([
+        html.Div([
+            html.H1("Innodanc Dashboard", 
+                    style=TEXT_STYLES['header']),
+            html.Div([
+                html.P("Developed by Team No.2 Magpies", 
+                       style={'color': COLOR_SCHEME['text'], 'fontSize': '28px', 'marginBottom': '8px'}),
+                html.P("周芸瑄 • 楊誼萱 • 高愷傑 • 林樂瑞", 
+                       style={'color': COLOR_SCHEME['text'], 'fontSize': '24px', 'opacity': '0.9'})
+            ], style={'marginTop': '12px'})
+        ], style={'textAlign': 'center'})
+    ], style={
+        'background': '#ffffff',
+        'marginBottom': '32px',
+        'boxShadow': '0 4px 6px rgba(0,0,0,0.1)',
+        'padding': '24px',
+        'border': f'1px solid {COLOR_SCHEME["secondary"]}'
+    }),
     
-    if cities:
-        filtered_df = filtered_df[filtered_df['City'].isin(cities)]
-
-    # Check if filtered data is empty
-    if len(filtered_df) == 0:
-        fig.add_annotation(
-            text="No data available for the selected filters",
-            xref="paper",
-            yref="paper",
-            x=0.5,
-            y=0.5,
-            showarrow=False,
-            font=dict(size=28, color=COLOR_SCHEME['text'])
-        )
-        return fig
-
-    # Create visualizations based on button clicked
-    if button_id == 'marketing-btn-gender':
-        gender_dist = filtered_df['Gender'].value_counts()
-        colors = [COLOR_SCHEME['secondary'], COLOR_SCHEME['accent']]
-        fig = go.Figure(data=[go.Pie(
-            labels=gender_dist.index,
-            values=gender_dist.values,
-            hole=0.3,
-            textinfo='label+percent',
-            textposition='outside',
-            marker_colors=colors
-        )])
-        fig.update_layout(
-            title=dict(
-                text='Gender Distribution by Selected Region',
-                y=0.95,
-                x=0.5,
-                xanchor='center',
-                yanchor='top'
+    # Tabs
+    dcc.Tabs(
+        id='tabs',
+        value='glimpse',
+        children=[
+            dcc.Tab(
+                label='Glimpse',
+                value='glimpse',
+                style=TAB_STYLE,
+                selected_style=TAB_SELECTED_STYLE
             ),
-            title_font_size=24,
-            legend=dict(
-                font=dict(size=20)
+            
+            # Overview Tab (existing)
+            dcc.Tab(
+                label='Overview',
+                value='overview',
+                style=TAB_STYLE,
+                selected_style=TAB_SELECTED_STYLE
+            ),     
+            # Operation & Finance Tab (existing)
+            dcc.Tab(
+                label='Operation & Finance',
+                value='operation',
+                style=TAB_STYLE,
+                selected_style=TAB_SELECTED_STYLE
             ),
-            uniformtext=dict(
-                mode='hide',
-                minsize=18
+            # marketing and customer support tab
+            dcc.Tab(
+                label='Marketing and Customer Support',
+                value='marketing',
+                style=TAB_STYLE,
+                selected_style=TAB_SELECTED_STYLE
             )
-        )
-
-    elif button_id == 'marketing-btn-age':
-        fig = go.Figure(data=[go.Histogram(
-            x=filtered_df['Age'],
-            nbinsx=20,
-            name='Age Distribution',
-            marker_color=COLOR_SCHEME['secondary']
-        )])
-        fig.update_layout(
-            title='Age Distribution by Selected Region',
-            xaxis_title='Age',
-            yaxis_title='Count'
-        )
-
-    elif button_id == 'marketing-btn-course':
-        course_dist = filtered_df['Course_Type_Name'].value_counts()
-        fig = go.Figure(data=[go.Bar(
-            x=course_dist.index,
-            y=course_dist.values,
-            text=course_dist.values,
-            textposition='auto',
-            marker_color=COLOR_SCHEME['secondary'],
-            name='Course Distribution',
-            hovertemplate="Course: %{x}<br>Count: %{y}<extra></extra>"
-        )])
-        fig.update_layout(
-            title='Course Type Distribution by Selected Region',
-            xaxis_title='Course Type',
-            yaxis_title='Count',
-            xaxis={'tickangle': 45},
-            #showlegend=False
-        )
-
-    elif button_id == 'marketing-btn-region':
-        # Get region distribution for bars
-        region_dist = filtered_df['Learning Area'].value_counts().sort_values(ascending=False)
-        n_regions = len(region_dist)
-        
-        # Get unique cities for legend
-        cities = filtered_df['City'].unique()
-        n_cities = len(cities)
-        
-        # Generate colors
-        colors = px.colors.sequential.Oranges[2:]
-        region_colors = colors[:n_regions] if n_regions <= len(colors) else colors * (n_regions // len(colors) + 1)
-        
-        # Create the bar chart with regions
-        fig = go.Figure(data=[go.Bar(
-            x=region_dist.index,
-            y=region_dist.values,
-            text=region_dist.values,
-            textposition='auto',
-            marker_color=region_colors,
-            showlegend=False,  # Hide the region legend
-            hovertemplate="Region: %{x}<br>Count: %{y}<extra></extra>"
-        )])
-        
-        # Add invisible scatter traces for city legend
-        for idx, city in enumerate(cities):
-            fig.add_trace(go.Scatter(
-                x=[None],
-                y=[None],
-                mode='markers',
-                marker=dict(color=region_colors[idx]),
-                name=city,
-                showlegend=True
-            ))
-        
-        fig.update_layout(
-            title='Region Distribution (Sorted by Count)',
-            xaxis_title='Region',
-            yaxis_title='Count',
-            xaxis={'tickangle': 45},
-            showlegend=True,
-            legend=dict(
-                font=dict(
-                    family='"Segoe UI", Arial, sans-serif',
-                    size=28,  # 增加圖例字體大小
-                    color=COLOR_SCHEME['text']
-                ),
-                orientation="h",
-                yanchor="bottom",
-                y=1.02,
-                xanchor="right",
-                x=1
+        ],
+        style={
+            'backgroundColor': 'transparent',
+            'borderBottom': '1px solid #d6d6d6',
+            'marginBottom': '24px',
+            'padding': '0 24px'
+        }
+    ),
+    # Filters shared by the Overview, Operation and Marketing tabs (hidden on Glimpse)
+    html.Div([
+        html.Div([
+            html.Label("Date Range", style=TEXT_STYLES['label']),
+            dcc.DatePickerRange(
+                id='date-range-combined',
+                start_date=ORDER_DATE_MIN,
+                end_date=ORDER_DATE_MAX,
+                display_format='YYYY-MM-DD',
+                style={'zIndex': 1000, 'fontSize': '16px'}
             )
-        )
+        ], style={'flex': '1', 'marginRight': '32px'}),
 
-    elif button_id == 'marketing-btn-age-course':
-        # Create age-course distribution
-        age_course_dist = filtered_df.groupby(['Age', 'Course_Type_Name']).size().unstack(fill_value=0)
-        
-        fig = go.Figure()
-        colors = px.colors.qualitative.Set3
-        
-        for idx, course in enumerate(age_course_dist.columns):
-            color = colors[idx % len(colors)]
-            fig.add_trace(
-                go.Scatter(
-                    x=age_course_dist.index,
-                    y=age_course_dist[course],
-                    name=course,
-                    mode='lines',
-                    stackgroup='one',
-                    line=dict(width=0.5),
-                    hovertemplate=(
-                        "Age: %{x}<br>" +
-                        "Count: %{y}<br>" +
-                        "<extra></extra>"
-                    )
-                )
+        html.Div([
+            html.Label("Age Range", style=TEXT_STYLES['label']),
+            dcc.RangeSlider(
+                id='age-range-demo',
+                min=AGE_MIN,
+                max=AGE_MAX,
+                step=1,
+                marks=AGE_MARKS,
+                value=[AGE_MIN, AGE_MAX]
             )
-        
-        fig.update_layout(
-            title='Age Distribution by Course Type in Selected Region',
-            xaxis_title='Age',
-            yaxis_title='Count',
-            hovermode='x unified'
-        )
+        ], style={'flex': '1', 'marginRight': '24px'}),
 
-    # Apply common styling
-    fig.update_layout(
-        plot_bgcolor='white',
-        paper_bgcolor='white',
-        font=dict(color=COLOR_SCHEME['text']),
-        title_x=0.5,
-        title_font=dict(size=24),
-        showlegend=True,
-        legend=dict(
-            orientation="h",
-            yanchor="bottom",
-            y=1.02,
-            xanchor="right",
-            x=1
-        )
-    )
+        html.Div([
+            html.Label("Course Type", style=TEXT_STYLES['label']),
+            dcc.Dropdown(
+                id='course-type-combined',
+                options=COURSE_OPTIONS,
+                multi=True,
+                style={'borderRadius': '8px', 'fontSize': '28px'}
+            )
+        ], style={'flex': '1', 'marginRight': '24px'}),
 
-    return fig
-# Update the chart styling function with larger fonts
-def update_chart_layout(fig):
-    fig.update_layout(
-        template='plotly_white',
-        paper_bgcolor='rgba(0,0,0,0)',
-        plot_bgcolor='rgba(0,0,0,0)',
-        font={
-            'family': '"Segoe UI", Arial, sans-serif',
-            'color': COLOR_SCHEME['text'],
-            'size': 28
-        },
-        title_font={
-            'family': '"Segoe UI", Arial, sans-serif',
-            'color': COLOR_SCHEME['primary'],
-            'size': 40
-        },
-        legend_title_font={
-            'family': '"Segoe UI", Arial, sans-serif',
-            'color': COLOR_SCHEME['primary']
-        },
-        hoverlabel={'font': {'size': 28}},
-        margin=dict(t=50, l=50, r=50, b=50)
-    )
-    return fig
+        html.Div([
+            html.Label("City", style=TEXT_STYLES['label']),
+            dcc.Dropdown(
+                id='region-revenue',
+                options=CITY_OPTIONS,
+                multi=True,
+                style={'borderRadius': '8px', 'fontSize': '28px'}
+            )
+        ], style={'flex': '1', 'marginRight': '24px'}),
 
+        html.Div([
+            html.Label("Gender", style=TEXT_STYLES['label']),
+            dcc.Dropdown(
+                id='gender-dropdown',
+                options=GENDER_OPTIONS,
+                multi=True,
+                style={'borderRadius': '8px', 'fontSize': '28px'}
+            ),
+        ], style={'flex': '1'}),
+        # Normalised filter values; every tab's charts listen to this only
+        dcc.Store(id='filter-state')
+    ], id='filter-panel', style=FILTER_PANEL_HIDDEN_STYLE),
+    html.Div(id='tab-content', children=build_glimpse())
+], style={
+    'backgroundColor': COLOR_SCHEME['background'],
+    'minHeight': '100vh',
+    'padding': '24px',
+    'fontFamily': '"Segoe UI", Arial, sans-serif'
+})
 
-# Teacher Class Trend Chart
+# Build the selected tab's content and show the filters on the filtered tabs
 @app.callback(
-    Output('teacher-class-trend', 'figure'),
-    [Input('date-range-combined', 'start_date'),
-     Input('date-range-combined', 'end_date'),
-     Input('age-range-demo', 'value'),
-     Input('course-type-combined', 'value'),
-     Input('region-revenue', 'value'),
-     Input('gender-dropdown', 'value')],
-    prevent_initial_call=False
+    [Output('tab-content', 'children'),
+     Output('filter-panel', 'style')],
+    Input('tabs', 'value'),
+    prevent_initial_call=True
 )
-def update_teacher_trend(start_date, end_date, age_range, course_types, cities, genders):
-    filtered_df = TP_data.copy()
-    
-    # Remove Unknown data
-    filtered_df = filtered_df[
-        (filtered_df['Teacher_Name'] != 'Unknown') & 
-        (filtered_df['Teacher_Name'].notna())
-    ]
-    
-    # Apply filters
+def render_content(tab):
+    filter_style = FILTER_PANEL_HIDDEN_STYLE if tab == 'glimpse' else FILTER_CARD_STYLE
+    return TAB_BUILDERS[tab](), filter_style
+
+
+def date_bounds(start_date, end_date):
+    """Date picker strings as datetime64[ns] scalars, comparable with the date columns' values"""
+    return np.datetime64(start_date, 'ns'), np.datetime64(end_date, 'ns')
+
+def category_mask(series, values):
+    """Boolean mask of a categorical series' rows whose label is in values"""
+    # Look the selected labels up once, then compare the integer codes
+    codes = series.cat.categories.get_indexer(values)
+    return np.isin(series.cat.codes.values, codes[codes >= 0])
+
+def filter_transactions(df, start_date, end_date, age_range, course_types, cities, genders,
+                        slabs=None):
+    """Apply the dashboard filters to a transaction frame with a single combined mask"""
+    # With slabs, the category filters pick whole partitions instead of scanning columns
+    if slabs is not None:
+        keys = [key for key in slabs
+                if (not cities or key[0] in cities)
+                and (not course_types or key[1] in course_types)
+                and (not genders or key[2] in genders)]
+        positions = np.concatenate([slabs[key] for key in keys]) if keys else np.empty(0, dtype=np.intp)
+        # Sorted positions keep the slice in date order
+        df = df.iloc[np.sort(positions)]
+        course_types = cities = genders = None
+    # Frames are sorted by Order_Date, so the date range is a contiguous slice
     if start_date and end_date:
-        filtered_df = filtered_df[
-            (filtered_df['Course_Date'] >= start_date) & 
-            (filtered_df['Course_Date'] <= end_date)
-        ]
+        start, end = date_bounds(start_date, end_date)
+        order_dates = df['Order_Date'].values
+        lo = order_dates.searchsorted(start, side='left')
+        hi = order_dates.searchsorted(end, side='right')
+        df = df.iloc[lo:hi]
+    mask = np.ones(len(df), dtype=bool)
     if age_range:
-        filtered_df = filtered_df[
-            (filtered_df['Student_Age'] >= age_range[0]) & 
-            (filtered_df['Student_Age'] <= age_range[1])
-        ]
+        ages = df['Customer_Age'].values
+        mask &= (ages >= age_range[0]) & (ages <= age_range[1])
+    if course_types:
+        mask &= category_mask(df['Course_Type_Name'], course_types)
     if cities:
-        filtered_df = filtered_df[filtered_df['Learning_City'].isin(cities)]
+        mask &= category_mask(df['City'], cities)
     if genders:
-        filtered_df = filtered_df[filtered_df['Student_Gender'].isin(genders)]
-
-
-    # Calculate total classes per teacher
-    teacher_totals = filtered_df.groupby('Teacher_Name').size().sort_values(ascending=False)
+        mask &= category_mask(df['Customer_Gender'], genders)
+    return df.iloc[np.flatnonzero(mask)]
+
+def as_cache_key(values):
+    """Hashable, order-independent form of a multi-value filter input"""
+    return tuple(sorted(values)) if values else None
+
+def pack_filter_state(start_date, end_date, age_range, course_types, cities, genders,
+                      current_state=None):
+    """Filter panel inputs in canonical form for the panel's filter-state store"""
+    state = [start_date, end_date] + [
+        sorted(values) if values else None
+        for values in (age_range, course_types, cities, genders)
+    ]
+    # Re-selecting the same filters (in any order) must not re-run every chart
+    if state == current_state:
+        raise PreventUpdate
+    return state
+
+def filter_state_args(state):
+    """Unpack a filter-state store into the charts' memoize-friendly arguments"""
+    if state is None:
+        raise PreventUpdate
+    start_date, end_date, age_range, course_types, cities, genders = state
+    return (start_date, end_date, as_cache_key(age_range), as_cache_key(course_types),
+            as_cache_key(cities), as_cache_key(genders))
+
+@cache.memoize()
+def _agg_monthly(start_date, end_date, age_range, course_types, cities, genders):
+    """Monthly revenue and growth rate for one filter combination"""
+    # Filter the pre-aggregated roll-up instead of the raw transactions
+    filtered_df = filter_transactions(revenue_rollup, start_date, end_date, age_range,
+                                      course_types, cities, genders, slabs=rollup_slabs)
+
+    # Calculate monthly revenue on the integer month key, label only the result
+    totals = filtered_df.groupby('Year_Month')['Amount'].sum()
+    monthly_revenue = pd.DataFrame({
+        'Order_Date': year_month_labels(totals.index),
+        'Amount': totals.values
+    })
     
-    # Select top 5 and bottom 5 teachers if more than 10 teachers
-    if len(teacher_totals) > 10:
-        top_teachers = list(teacher_totals.head(5).index)
-        #bottom_teachers = list(teacher_totals.tail(5).index)
-        #selected_teachers = top_teachers + bottom_teachers
-        selected_teachers = top_teachers
-        filtered_df = filtered_df[filtered_df['Teacher_Name'].isin(selected_teachers)]
-
-    # Calculate monthly class counts per teacher
-    monthly_classes = filtered_df.groupby([
-        filtered_df['Course_Date'].dt.strftime('%Y-%m'),
-        'Teacher_Name'
-    ]).size().reset_index(name='Class_Count')
-
-    # Create figure
-    fig = go.Figure()
-    # Create data for the bar chart with X-axis as Teacher, Y-axis as Sales, and Color as Month
-    teacher_sales_data = monthly_classes.groupby(['Teacher_Name', 'Course_Date'])['Class_Count'].sum().reset_index()
-    total_sales_per_teacher = teacher_sales_data.groupby('Teacher_Name')['Class_Count'].sum().sort_values(ascending=False).reset_index()
-    total_sales_per_teacher.rename(columns={'Class_Count': 'Total_Sales'}, inplace=True)
-
-    # 定義 selected_teachers 列表，按照 Total_Sales 降序排序
-    selected_teachers = total_sales_per_teacher['Teacher_Name'].tolist()
-
-    # 設定 Teacher_Name 的順序，並將數據根據這個順序排序
-    teacher_sales_data['Teacher_Name'] = pd.Categorical(
-        teacher_sales_data['Teacher_Name'],
-        categories=selected_teachers,  # 使用 selected_teachers 列表作為順序
-        ordered=True
-    )
+    # Calculate growth rate
+    monthly_revenue['Growth_Rate'] = growth_rate(monthly_revenue['Amount'].values)
+    return monthly_revenue
 
-    # 按照新的 X 軸順序和日期排序
-    teacher_sales_data = teacher_sales_data.sort_values(by=['Teacher_Name', 'Course_Date']).reset_index(drop=True)
+@cache.memoize()
+def _agg_booking(start_date, end_date, age_range, course_types, cities, genders):
+    """Day-of-week x month order amount pivot for one filter combination"""
+    # Filter the pre-aggregated roll-up instead of the raw transactions
+    filtered_df = filter_transactions(revenue_rollup, start_date, end_date, age_range,
+                                      course_types, cities, genders, slabs=rollup_slabs)
+
+    # Pivot the data for the heatmap: unstack the integer-keyed sums with zeros
+    # filled in during the reshape, then label only the resulting axes
+    heatmap_pivot = filtered_df.groupby(['Weekday', 'Year_Month'])['Amount'].sum().unstack(fill_value=0)
+    heatmap_pivot.index = pd.Index([DAYS_ORDER[day] for day in heatmap_pivot.index], name='Day_of_Week')
+    heatmap_pivot.columns = pd.Index(year_month_labels(heatmap_pivot.columns), name='Month')
+
+    # Reindex rows explicitly; days without orders become zero rows
+    return heatmap_pivot.reindex(index=DAYS_ORDER, fill_value=0)
+
+@cache.memoize()
+def _filter_demographics(start_date, end_date, age_range, course_types, cities):
+    """Students matching one filter combination, from DA_data"""
+    # Students with an order in the date range (a slice of the date-sorted frame)
+    filtered_transactions = filter_transactions(base_data, start_date, end_date,
+                                                None, None, None, None)
+    relevant_students = np.unique(filtered_transactions['Student_id'].values)
+
+    # One combined mask over DA_data, applied once
+    mask = np.isin(DA_data['StudentID'].values, relevant_students)
+    if age_range:
+        ages = DA_data['Age'].values
+        mask &= (ages >= age_range[0]) & (ages <= age_range[1])
+    if course_types:
+        mask &= category_mask(DA_data['Course_Type_Name'], course_types)
+    if cities:
+        mask &= category_mask(DA_data['City'], cities)
+    return DA_data.iloc[np.flatnonzero(mask)]
+
+@cache.memoize()
+def _teacher_course_positions(start_date, end_date, age_range, cities, genders):
+    """Row positions in TP_data of known teachers' courses matching one filter combination"""
+    teachers = TP_data['Teacher_Name']
+    mask = (teachers != 'Unknown').values & teachers.notna().values
+    if start_date and end_date:
+        start, end = date_bounds(start_date, end_date)
+        course_dates = TP_data['Course_Date'].values
+        mask &= (course_dates >= start) & (course_dates <= end)
+    if age_range:
+        ages = TP_data['Student_Age'].values
+        mask &= (ages >= age_range[0]) & (ages <= age_range[1])
+    if cities:
+        mask &= category_mask(TP_data['Learning_City'], cities)
+    if genders:
+        mask &= category_mask(TP_data['Student_Gender'], genders)
+    return np.flatnonzero(mask)
 
-    teacher_sales_data['Course_Date'] = pd.to_datetime(teacher_sales_data['Course_Date']).dt.strftime('%b')
+def filter_teacher_courses(start_date, end_date, age_range, cities, genders):
+    """Course rows of known teachers matching the dashboard filters, from TP_data"""
+    return TP_data.iloc[_teacher_course_positions(start_date, end_date, as_cache_key(age_range),
+                                                  as_cache_key(cities), as_cache_key(genders))]
 
+@cache.memoize()
+def teacher_aggregates(start_date, end_date, age_range, cities, genders):
+    """Per-teacher tables behind the teacher charts, from one filtered TP_data slice"""
+    filtered_df = filter_teacher_courses(start_date, end_date, age_range, cities, genders)
 
-   # 確保 Course_Date 的排序為正確的月份順序
-    teacher_sales_data['Course_Date'] = pd.Categorical(
-        teacher_sales_data['Course_Date'],
-        categories=[
-            'Jan', 'Feb', 'Mar', 'Apr', 'May', 'Jun',
-            'Jul', 'Aug', 'Sep', 'Oct', 'Nov', 'Dec'
-        ],
-        ordered=True
-    )
+    # 確認 Student_ID 列名
+    student_id_column = 'Student_ID'  # 確保這是正確的列名
+    if student_id_column not in filtered_df.columns:
+        raise KeyError(f"Column '{student_id_column}' not found in DataFrame")
 
-    # 定義新的顏色映射
-    color_mapping = {
-        'Jan': "#272727",  # Raisin black
-        'Feb': "#9EA7AD",  # Cadet gray
-        'Mar': "#E6E6E6",  # Platinum
-        'Apr': "#F3CEA3",  # Sunset
-        'May': "#FFB65F",  # Earth yellow
-        'Jun': "#F89E4A",  # Sandy brown
-        'Jul': "#F18635",  # Orange (wheel)
-        'Aug': "#CC854E",  # Caramel
-        'Sep': "#B6895C",  # New color 1 (焦糖棕調)
-        'Oct': "#AA8A6D",  # New color 2 (溫暖米色調)
-        'Nov': "#A78466",  # Chamoisee
-        'Dec': "#AF8F74",  # Beaver
-    }
+    # Class counts per teacher (rows) and calendar month (columns), busiest teachers first
+    calendar_month = (filtered_df['Course_Month'] % 100).rename('Month')
+    class_counts = filtered_df.groupby(['Teacher_Name', calendar_month], observed=True).size().unstack(fill_value=0)
+    class_counts = class_counts.loc[class_counts.sum(axis=1).sort_values(ascending=False, kind='stable').index]
 
-    # 定義新的顏色映射
-    color_mapping = {
-        'Jan': "#272727",  # Raisin black
-        'Feb': "#63676A",  # Cadet gray
-        'Mar': "#9EA7AD",  # Platinum
-        'Apr': "#E6E6E6",  # Sunset
-        'May': "#F3CEA3",  # Earth yellow
-        'Jun': "#F8AE6C",  # Sandy brown
-        'Jul': "#FFB65F",  # Orange (wheel)
-        'Aug': "#F89E4A",  # Caramel
-        'Sep': "#F18635",  # 焦糖棕調
-        'Oct': "#CC854E",  # 溫暖米色調
-        'Nov': "#AA8A6D",  # Chamoisee
-        'Dec': "#A78466"  # 更新顏色 (溫暖棕調)
+    return {
+        'class_counts': class_counts,
+        'unique_students': unique_students_by_age_group(filtered_df, student_id_column),
+        'student_totals': unique_students_by_teacher(filtered_df, student_id_column).sort_values(ascending=False)
     }
 
-    # 繪製堆疊條形圖
-    fig = go.Figure()
-
-    # 為每個月份添加條形
-    for month in teacher_sales_data['Course_Date'].cat.categories:
-        month_data = teacher_sales_data[teacher_sales_data['Course_Date'] == month]
-        fig.add_trace(go.Bar(
-            x=month_data['Teacher_Name'],  # X 軸為教師名稱，順序已按 selected_teachers 排列
-            y=month_data['Class_Count'],
-            name=month,
-            marker_color=color_mapping[month]  # 使用映射的顏色
-        ))
-
-    # 更新 layout
-    # Sales Volume by Teacher (Sorted by Total Sales)
-    fig.update_layout(
-        barmode='stack',  # 堆疊模式
-        title={
-            'text': 'Teacher Performance Analysis',
-            'y': 0.95,
-            'x': 0.5,
-            'xanchor': 'center',
-            'yanchor': 'top',
-            'font': dict(size=24)
-        },
-        xaxis_title="Teacher",
-        yaxis_title="Sales Volume",
-        height=600,
-        margin=dict(l=100, r=100, t=100, b=100),
-        legend=dict(
-            orientation="v",  # 水平排列
-            yanchor="bottom",
-            y=0,
-            xanchor="center",
-            x=9,
-            font=dict(size=13),
-            title_text="Month"
-        ),
-        xaxis=dict(
-            tickangle=45
-        ),
-        autosize=True,
-        plot_bgcolor='rgba(0,0,0,0)',
-        paper_bgcolor='rgba(0,0,0,0)'
+def unique_students_by_teacher(df, student_id_column):
+    """Unique students per teacher present in a TP_data slice"""
+    # Same packed-key trick as unique_students_by_age_group, with the teacher as the only cell
+    teacher_names = df['Teacher_Name'].cat.categories
+    teacher_codes = df['Teacher_Name'].cat.codes.to_numpy().astype('int64')
+    students = df[student_id_column]
+    valid = students.notna().to_numpy()
+    student_codes, student_ids = pd.factorize(students.to_numpy()[valid])
+    span = max(len(student_ids), 1)
+    unique_keys = np.unique(teacher_codes[valid] * span + student_codes)
+    counts = np.bincount(unique_keys // span, minlength=len(teacher_names))
+    # Keep every teacher with a course in the slice, as groupby(observed=True) would
+    present = np.bincount(teacher_codes, minlength=len(teacher_names)) > 0
+    return pd.Series(counts[present], index=pd.Index(teacher_names[present], name='Teacher_Name'),
+                     name=student_id_column)
+
+def unique_students_by_age_group(df, student_id_column):
+    """Teacher x age group counts of unique students in a TP_data slice"""
+    # Age groups are binned at load; code -1 marks ages outside every bin
+    age_codes = df['Age_Group'].cat.codes.to_numpy()
+    students = df[student_id_column]
+    valid = (age_codes >= 0) & students.notna().to_numpy()
+    age_codes = age_codes[valid]
+
+    # Pack (teacher, age group, student) into one integer key, dedupe the keys
+    # with np.unique and count the (teacher, age group) part with bincount
+    teacher_names = df['Teacher_Name'].cat.categories
+    cell_codes = df['Teacher_Name'].cat.codes.to_numpy()[valid].astype('int64') * len(AGE_GROUPS) + age_codes
+    student_codes, student_ids = pd.factorize(students.to_numpy()[valid])
+    span = max(len(student_ids), 1)
+    unique_keys = np.unique(cell_codes * span + student_codes)
+    counts = np.bincount(
+        unique_keys // span,
+        minlength=len(teacher_names) * len(AGE_GROUPS)
+    ).reshape(len(teacher_names), len(AGE_GROUPS))
+    return pd.DataFrame(
+        counts,
+        index=pd.Index(teacher_names, name='Teacher_Name'),
+        columns=pd.Index(AGE_GROUPS, name='Age_Group')
     )
 
-    return fig
-
-# Teacher Class Trend Chart
-@app.callback(
-    Output('operation-teacher-class-trend', 'figure'),
-    [Input('operation-date-range-combined', 'start_date'),
-     Input('operation-date-range-combined', 'end_date'),
-     Input('operation-age-range-demo', 'value'),
-     Input('operation-course-type-combined', 'value'),
-     Input('operation-region-revenue', 'value'),
-     Input('operation-gender-dropdown', 'value')],
-    prevent_initial_call=False
-)
-def update_teacher_trend(start_date, end_date, age_range, course_types, cities, genders):
-    filtered_df = TP_data.copy()
-    
-    # Remove Unknown data
-    filtered_df = filtered_df[
-        (filtered_df['Teacher_Name'] != 'Unknown') & 
-        (filtered_df['Teacher_Name'].notna())
-    ]
-    
-    # Apply filters
-    if start_date and end_date:
-        filtered_df = filtered_df[
-            (filtered_df['Course_Date'] >= start_date) & 
-            (filtered_df['Course_Date'] <= end_date)
-        ]
-    if age_range:
-        filtered_df = filtered_df[
-            (filtered_df['Student_Age'] >= age_range[0]) & 
-            (filtered_df['Student_Age'] <= age_range[1])
-        ]
-    if cities:
-        filtered_df = filtered_df[filtered_df['Learning_City'].isin(cities)]
-    if genders:
-        filtered_df = filtered_df[filtered_df['Student_Gender'].isin(genders)]
-
-
-    # Calculate total classes per teacher
-    teacher_totals = filtered_df.groupby('Teacher_Name').size().sort_values(ascending=False)
-    
-    # Select top 5 and bottom 5 teachers if more than 10 teachers
-    if len(teacher_totals) > 10:
-        top_teachers = list(teacher_totals.head(5).index)
-        #bottom_teachers = list(teacher_totals.tail(5).index)
-        #selected_teachers = top_teachers + bottom_teachers
-        selected_teachers = top_teachers
-        filtered_df = filtered_df[filtered_df['Teacher_Name'].isin(selected_teachers)]
-
-    # Calculate monthly class counts per teacher
-    monthly_classes = filtered_df.groupby([
-        filtered_df['Course_Date'].dt.strftime('%Y-%m'),
-        'Teacher_Name'
-    ]).size().reset_index(name='Class_Count')
-
-    # Create figure
-    fig = go.Figure()
-    # Create data for the bar chart with X-axis as Teacher, Y-axis as Sales, and Color as Month
-    teacher_sales_data = monthly_classes.groupby(['Teacher_Name', 'Course_Date'])['Class_Count'].sum().reset_index()
-    total_sales_per_teacher = teacher_sales_data.groupby('Teacher_Name')['Class_Count'].sum().sort_values(ascending=False).reset_index()
-    total_sales_per_teacher.rename(columns={'Class_Count': 'Total_Sales'}, inplace=True)
-
-    # 定義 selected_teachers 列表，按照 Total_Sales 降序排序
-    selected_teachers = total_sales_per_teacher['Teacher_Name'].tolist()
-
-    # 設定 Teacher_Name 的順序，並將數據根據這個順序排序
-    teacher_sales_data['Teacher_Name'] = pd.Categorical(
-        teacher_sales_data['Teacher_Name'],
-        categories=selected_teachers,  # 使用 selected_teachers 列表作為順序
-        ordered=True
+# Figures are memoized as plain dicts per filter combination, so repeated
+# filter states skip the aggregation and the go.Figure build/validation
+@cache.memoize()
+def _monthly_revenue_figure(start_date, end_date, age_range, course_types, cities, genders):
+    """Monthly revenue chart for one filter combination"""
+    monthly_revenue = _agg_monthly(start_date, end_date, age_range, course_types, cities, genders)
+
+    # Labels for the growth rate line (kept local; the aggregate is a shared cached value)
+    growth_labels = [f"{x:.1f}%" for x in monthly_revenue['Growth_Rate'].values]
+    # Revenue bars on the primary axis, growth rate line on the secondary one
+    fig = go.Figure(
+        data=[
+            go.Bar(
+                x=monthly_revenue['Order_Date'],
+                y=monthly_revenue['Amount'],
+                name="Monthly Revenue",
+                marker_color=COLOR_SCHEME['secondary'],
+                xaxis='x',
+                yaxis='y'
+            ),
+            go.Scatter(
+                x=monthly_revenue['Order_Date'],
+                y=monthly_revenue['Growth_Rate'],
+                name="Growth Rate (%)",
+                line=dict(color=COLOR_SCHEME['accent']),
+                text=growth_labels,
+                textposition='top center',  
+                textfont=dict(color='#024959'), 
+                hovertemplate="Growth Rate: %{text}", 
+                mode='lines+markers+text',
+                xaxis='x',
+                yaxis='y2'
+            )
+        ],
+        layout=MONTHLY_LAYOUT
     )
 
-    # 按照新的 X 軸順序和日期排序
-    teacher_sales_data = teacher_sales_data.sort_values(by=['Teacher_Name', 'Course_Date']).reset_index(drop=True)
-
-    teacher_sales_data['Course_Date'] = pd.to_datetime(teacher_sales_data['Course_Date']).dt.strftime('%b')
+    return fig.to_plotly_json()
 
+@cache.memoize()
+def _booking_heatmap_figure(variant, start_date, end_date, age_range, course_types, cities, genders):
+    """Booking heatmap for one filter combination, styled for the given tab"""
+    heatmap_pivot = _agg_booking(start_date, end_date, age_range, course_types, cities, genders)
+    days_order = heatmap_pivot.index.tolist()
 
-   # 確保 Course_Date 的排序為正確的月份順序
-    teacher_sales_data['Course_Date'] = pd.Categorical(
-        teacher_sales_data['Course_Date'],
-        categories=[
-            'Jan', 'Feb', 'Mar', 'Apr', 'May', 'Jun',
-            'Jul', 'Aug', 'Sep', 'Oct', 'Nov', 'Dec'
-        ],
-        ordered=True
+    # Create heatmap
+    fig = go.Figure(
+        data=[go.Heatmap(
+            x=heatmap_pivot.columns.values,
+            y=days_order,
+            z=heatmap_pivot.values,
+            coloraxis='coloraxis',
+            name='0',
+            xaxis='x',
+            yaxis='y',
+            hovertemplate="Month: %{x}<br>Day of the Week: %{y}<br>Total Amount: %{z}<extra></extra>"
+        )],
+        layout=BOOKING_LAYOUTS[variant]
     )
 
-    # 定義新的顏色映射
-    color_mapping = {
-        'Jan': "#272727",  # Raisin black
-        'Feb': "#9EA7AD",  # Cadet gray
-        'Mar': "#E6E6E6",  # Platinum
-        'Apr': "#F3CEA3",  # Sunset
-        'May': "#FFB65F",  # Earth yellow
-        'Jun': "#F89E4A",  # Sandy brown
-        'Jul': "#F18635",  # Orange (wheel)
-        'Aug': "#CC854E",  # Caramel
-        'Sep': "#B6895C",  # New color 1 (焦糖棕調)
-        'Oct': "#AA8A6D",  # New color 2 (溫暖米色調)
-        'Nov': "#A78466",  # Chamoisee
-        'Dec': "#AF8F74",  # Beaver
-    }
+    return fig.to_plotly_json()
+
+@cache.memoize()
+def _teacher_trend_figure(start_date, end_date, age_range, cities, genders):
+    """Teacher class trend chart for one filter combination"""
+    # Teacher x month class counts, already sorted by total classes
+    class_counts = teacher_aggregates(start_date, end_date, age_range, cities, genders)['class_counts']
+    
+    # Keep the top 5 teachers if there are more than 10
+    if len(class_counts) > 10:
+        class_counts = class_counts.head(5)
 
     # 定義新的顏色映射
     color_mapping = {
@@ -2529,17 +1420,21 @@ def update_teacher_trend(start_date, end_date, age_range, course_types, cities,
     # 繪製堆疊條形圖
     fig = go.Figure()
 
-    # 為每個月份添加條形
-    for month in teacher_sales_data['Course_Date'].cat.categories:
-        month_data = teacher_sales_data[teacher_sales_data['Course_Date'] == month]
-        fig.add_trace(go.Bar(
-            x=month_data['Teacher_Name'],  # X 軸為教師名稱，順序已按 selected_teachers 排列
-            y=month_data['Class_Count'],
+    # 為每個月份添加條形 (months in calendar order, teachers with classes that month)
+    month_bars = []
+    for month_number, month in enumerate(MONTH_ABBRS, start=1):
+        month_counts = class_counts.get(month_number, pd.Series(dtype='int64'))
+        month_counts = month_counts[month_counts > 0]
+        month_bars.append(go.Bar(
+            x=month_counts.index,  # X 軸為教師名稱，順序已按 selected_teachers 排列
+            y=month_counts.values,
             name=month,
             marker_color=color_mapping[month]  # 使用映射的顏色
         ))
+    fig.add_traces(month_bars)
 
     # 更新 layout
+    # Sales Volume by Teacher (Sorted by Total Sales)
     fig.update_layout(
         barmode='stack',  # 堆疊模式
         title={
@@ -2556,283 +1451,35 @@ def update_teacher_trend(start_date, end_date, age_range, course_types, cities,
         margin=dict(l=100, r=100, t=100, b=100),
         legend=dict(
             orientation="v",  # 水平排列
-            yanchor="bottom",
-            y=0,
-            xanchor="center",
-            x=9,
-            font=dict(size=13),
-            title_text="Month"
-        ),
-        xaxis=dict(
-            tickangle=45
-        ),
-        autosize=True,
-        plot_bgcolor='rgba(0,0,0,0)',
-        paper_bgcolor='rgba(0,0,0,0)'
-    )
-
-    return fig
-
-
-# Teacher Student Distribution Heatmap
-@app.callback(
-    Output('teacher-student-heatmap', 'figure'),
-    [Input('date-range-combined', 'start_date'),
-     Input('date-range-combined', 'end_date'),
-     Input('age-range-demo', 'value'),
-     Input('course-type-combined', 'value'),
-     Input('region-revenue', 'value'),
-     Input('gender-dropdown', 'value')],
-    prevent_initial_call=False
-)
-    
-def update_teacher_trend(start_date, end_date, age_range, course_types, cities, genders):
-    filtered_df = TP_data.copy()
-    
-    # Remove Unknown data
-    filtered_df = filtered_df[
-        (filtered_df['Teacher_Name'] != 'Unknown') & 
-        (filtered_df['Teacher_Name'].notna())
-    ]
-    
-    # Apply filters
-    if start_date and end_date:
-        filtered_df = filtered_df[
-            (filtered_df['Course_Date'] >= start_date) & 
-            (filtered_df['Course_Date'] <= end_date)
-        ]
-    if age_range:
-        filtered_df = filtered_df[
-            (filtered_df['Student_Age'] >= age_range[0]) & 
-            (filtered_df['Student_Age'] <= age_range[1])
-        ]
-    if cities:
-        filtered_df = filtered_df[filtered_df['Learning_City'].isin(cities)]
-    if genders:
-        filtered_df = filtered_df[filtered_df['Student_Gender'].isin(genders)]
-
-    # Calculate total classes per teacher
-    teacher_totals = filtered_df.groupby('Teacher_Name').size().sort_values(ascending=False)
-    
-    # Select top 5 and bottom 5 teachers if more than 10 teachers
-    if len(teacher_totals) > 10:
-        top_teachers = list(teacher_totals.head(5).index)
-        #bottom_teachers = list(teacher_totals.tail(5).index)
-        #selected_teachers = top_teachers + bottom_teachers
-        selected_teachers = top_teachers
-        filtered_df = filtered_df[filtered_df['Teacher_Name'].isin(selected_teachers)]
-
-    #filtered_df = TP_data.copy()
-    
-    # 打印列名以檢查
-    print("Available columns:", filtered_df.columns.tolist())
-    
-    # Remove Unknown data
-    filtered_df = filtered_df[
-        (filtered_df['Teacher_Name'].notna()) & 
-        (filtered_df['Teacher_Name'] != 'Unknown')
-    ]
-    
-    # Apply filters
-    if start_date and end_date:
-        filtered_df = filtered_df[
-            (filtered_df['Course_Date'] >= start_date) & 
-            (filtered_df['Course_Date'] <= end_date)
-        ]
-    if age_range:
-        filtered_df = filtered_df[
-            (filtered_df['Student_Age'] >= age_range[0]) & 
-            (filtered_df['Student_Age'] <= age_range[1])
-        ]
-    if cities:
-        filtered_df = filtered_df[filtered_df['Learning_City'].isin(cities)]
-    if genders:
-        filtered_df = filtered_df[filtered_df['Student_Gender'].isin(genders)]
-
-    # Create student age groups
-    filtered_df['Age_Group'] = pd.cut(
-        filtered_df['Student_Age'],
-        bins=[0, 20, 30, 40, 50, 100],
-        labels=['0-20', '21-30', '31-40', '41-50', '50+']
-    )
-
-    # 確認 Student_ID 列名
-    student_id_column = 'Student_ID'  # 確保這是正確的列名
-    if student_id_column not in filtered_df.columns:
-        raise KeyError(f"Column '{student_id_column}' not found in DataFrame")
-
-    # Count unique students per teacher and age group
-    unique_students = filtered_df.groupby(['Teacher_Name', 'Age_Group'])[student_id_column].nunique().reset_index()
-
-    # Pivot the data
-    heatmap_data = unique_students.pivot(
-        index='Teacher_Name', 
-        columns='Age_Group', 
-        values=student_id_column
-    ).fillna(0)
-
-    # Calculate total unique students per teacher for sorting
-    teacher_totals = filtered_df.groupby('Teacher_Name')[student_id_column].nunique().sort_values(ascending=False)
-    
-    # Select top 10 teachers if more than 10 teachers
-    if len(teacher_totals) > 5:
-        selected_teachers = list(teacher_totals.head(5).index)
-        heatmap_data = heatmap_data.loc[selected_teachers]
-        teacher_totals = teacher_totals[selected_teachers]
-
-    # Sort heatmap data by total students
-    heatmap_data = heatmap_data.loc[teacher_totals.index]
-
-    # Create heatmap
-    fig = px.imshow(
-        heatmap_data,
-        labels=dict(x="Age Group", y="Teacher", color="Number of Unique Students"),
-        color_continuous_scale=[
-            [0, "grey"],
-            [0.5, "#ffe5bd"],
-            [1, "#EDB265"]
-        ],
-        aspect="auto"
-    )
-
-    # Update layout
-    # Teacher-Student Age Distribution (Unique Students)
-    title_text = 'Teacher Audience Analysis'
-    if len(teacher_totals) > 5:
-        title_text += ' (Top 5 Teachers)'
-        
-    fig.update_layout(
-        title={
-            'text': title_text,
-            'y': 0.95,
-            'x': 0.5,
-            'xanchor': 'center',
-            'yanchor': 'top',
-            'font': dict(size=24)
-        },
-        height=500,
-        margin=dict(l=100, r=100, t=100, b=100),
-        xaxis=dict(
-            tickangle=0,
-            tickfont=dict(size=18),
-            titlefont=dict(size=20)
-        ),
-        yaxis=dict(
-            tickfont=dict(size=18),
-            titlefont=dict(size=20),
-            title="Teacher (Unique Students)"
-        )
-    )
-
-    # Add total unique students to y-axis labels
-    #fig.update_yaxes(
-    #    ticktext=[f"{teacher} ({int(teacher_totals[teacher])} students)" 
-    #             for teacher in heatmap_data.index],
-    #    tickvals=list(range(len(heatmap_data.index)))
-    #)
-
-    return fig
-
-@app.callback(
-    Output('marketing-teacher-student-heatmap', 'figure'),
-    [Input('marketing-date-range-combined', 'start_date'),
-     Input('marketing-date-range-combined', 'end_date'),
-     Input('marketing-age-range-demo', 'value'),
-     Input('marketing-course-type-combined', 'value'),
-     Input('marketing-region-revenue', 'value'),
-     Input('marketing-gender-dropdown', 'value')],
-    prevent_initial_call=False
-)
-    
-def update_teacher_trend(start_date, end_date, age_range, course_types, cities, genders):
-    filtered_df = TP_data.copy()
-    
-    # Remove Unknown data
-    filtered_df = filtered_df[
-        (filtered_df['Teacher_Name'] != 'Unknown') & 
-        (filtered_df['Teacher_Name'].notna())
-    ]
-    
-    # Apply filters
-    if start_date and end_date:
-        filtered_df = filtered_df[
-            (filtered_df['Course_Date'] >= start_date) & 
-            (filtered_df['Course_Date'] <= end_date)
-        ]
-    if age_range:
-        filtered_df = filtered_df[
-            (filtered_df['Student_Age'] >= age_range[0]) & 
-            (filtered_df['Student_Age'] <= age_range[1])
-        ]
-    if cities:
-        filtered_df = filtered_df[filtered_df['Learning_City'].isin(cities)]
-    if genders:
-        filtered_df = filtered_df[filtered_df['Student_Gender'].isin(genders)]
-
-    # Calculate total classes per teacher
-    teacher_totals = filtered_df.groupby('Teacher_Name').size().sort_values(ascending=False)
-    
-    # Select top 5 and bottom 5 teachers if more than 10 teachers
-    if len(teacher_totals) > 10:
-        top_teachers = list(teacher_totals.head(5).index)
-        #bottom_teachers = list(teacher_totals.tail(5).index)
-        #selected_teachers = top_teachers + bottom_teachers
-        selected_teachers = top_teachers
-        filtered_df = filtered_df[filtered_df['Teacher_Name'].isin(selected_teachers)]
-
-    #filtered_df = TP_data.copy()
-    
-    # 打印列名以檢查
-    print("Available columns:", filtered_df.columns.tolist())
-    
-    # Remove Unknown data
-    filtered_df = filtered_df[
-        (filtered_df['Teacher_Name'].notna()) & 
-        (filtered_df['Teacher_Name'] != 'Unknown')
-    ]
-    
-    # Apply filters
-    if start_date and end_date:
-        filtered_df = filtered_df[
-            (filtered_df['Course_Date'] >= start_date) & 
-            (filtered_df['Course_Date'] <= end_date)
-        ]
-    if age_range:
-        filtered_df = filtered_df[
-            (filtered_df['Student_Age'] >= age_range[0]) & 
-            (filtered_df['Student_Age'] <= age_range[1])
-        ]
-    if cities:
-        filtered_df = filtered_df[filtered_df['Learning_City'].isin(cities)]
-    if genders:
-        filtered_df = filtered_df[filtered_df['Student_Gender'].isin(genders)]
-
-    # Create student age groups
-    filtered_df['Age_Group'] = pd.cut(
-        filtered_df['Student_Age'],
-        bins=[0, 20, 30, 40, 50, 100],
-        labels=['0-20', '21-30', '31-40', '41-50', '50+']
+            yanchor="bottom",
+            y=0,
+            xanchor="center",
+            x=9,
+            font=dict(size=13),
+            title_text="Month"
+        ),
+        xaxis=dict(
+            tickangle=45
+        ),
+        autosize=True,
+        plot_bgcolor='rgba(0,0,0,0)',
+        paper_bgcolor='rgba(0,0,0,0)'
     )
 
-    # 確認 Student_ID 列名
-    student_id_column = 'Student_ID'  # 確保這是正確的列名
-    if student_id_column not in filtered_df.columns:
-        raise KeyError(f"Column '{student_id_column}' not found in DataFrame")
+    return fig.to_plotly_json()
 
-    # Count unique students per teacher and age group
-    unique_students = filtered_df.groupby(['Teacher_Name', 'Age_Group'])[student_id_column].nunique().reset_index()
+@cache.memoize()
+def _teacher_heatmap_figure(start_date, end_date, age_range, cities, genders):
+    """Teacher x age group student heatmap for one filter combination"""
+    aggregates = teacher_aggregates(start_date, end_date, age_range, cities, genders)
 
-    # Pivot the data
-    heatmap_data = unique_students.pivot(
-        index='Teacher_Name', 
-        columns='Age_Group', 
-        values=student_id_column
-    ).fillna(0)
+    # Teacher x age group matrix of unique students (every age group kept as a column)
+    heatmap_data = aggregates['unique_students']
 
-    # Calculate total unique students per teacher for sorting
-    teacher_totals = filtered_df.groupby('Teacher_Name')[student_id_column].nunique().sort_values(ascending=False)
+    # Total unique students per teacher, sorted for both selection and ordering
+    teacher_totals = aggregates['student_totals']
     
-    # Select top 10 teachers if more than 10 teachers
+    # Select top 5 teachers if more than 5 teachers
     if len(teacher_totals) > 5:
         selected_teachers = list(teacher_totals.head(5).index)
         heatmap_data = heatmap_data.loc[selected_teachers]
@@ -2854,6 +1501,7 @@ def update_teacher_trend(start_date, end_date, age_range, course_types, cities,
     )
 
     # Update layout
+    # Teacher-Student Age Distribution (Unique Students)
     title_text = 'Teacher Audience Analysis'
     if len(teacher_totals) > 5:
         title_text += ' (Top 5 Teachers)'
@@ -2881,14 +1529,359 @@ def update_teacher_trend(start_date, end_date, age_range, course_types, cities,
         )
     )
 
-    # Add total unique students to y-axis labels
-    #fig.update_yaxes(
-    #    ticktext=[f"{teacher} ({int(teacher_totals[teacher])} students)" 
-    #             for teacher in heatmap_data.index],
-    #    tickvals=list(range(len(heatmap_data.index)))
-    #)
+    return fig.to_plotly_json()
 
-    return fig
+def trace_patch(figure):
+    """Patch that swaps in a figure's traces and keeps the layout already on the graph"""
+    patch = Patch()
+    patch['data'] = figure['data']
+    return patch
+
+# Filter panel state
+@app.callback(
+    Output('filter-state', 'data'),
+    [Input('date-range-combined', 'start_date'),
+     Input('date-range-combined', 'end_date'),
+     Input('age-range-demo', 'value'),
+     Input('course-type-combined', 'value'),
+     Input('region-revenue', 'value'),
+     Input('gender-dropdown', 'value')],
+    State('filter-state', 'data'),
+    prevent_initial_call=False
+)
+def update_filter_state(start_date, end_date, age_range, course_types, cities, genders, current_state):
+    return pack_filter_state(start_date, end_date, age_range, course_types, cities, genders,
+                             current_state)
+
+# Callback for Monthly Revenue Chart
+@app.callback(
+    Output('monthly-revenue-chart', 'figure'),
+    Input('filter-state', 'data'),
+    prevent_initial_call=False
+)
+def update_monthly_revenue(filter_state):
+    return trace_patch(_monthly_revenue_figure(*filter_state_args(filter_state)))
+
+# Callback for Monthly Revenue Chart
+@app.callback(
+    Output('operation-monthly-revenue-chart', 'figure'),
+    Input('filter-state', 'data'),
+    prevent_initial_call=False
+)
+def update_monthly_revenue(filter_state):
+    return trace_patch(_monthly_revenue_figure(*filter_state_args(filter_state)))
+
+
+
+# Callback for Booking Heatmap
+@app.callback(
+    Output('booking-heatmap', 'figure'),
+    Input('filter-state', 'data'),
+    prevent_initial_call=False
+)
+def update_booking_heatmap(filter_state):
+    return trace_patch(_booking_heatmap_figure(OVERVIEW_BOOKING, *filter_state_args(filter_state)))
+
+# Callback for Booking Heatmap
+@app.callback(
+    Output('marketing-booking-heatmap', 'figure'),
+    Input('filter-state', 'data'),
+    prevent_initial_call=False
+)
+def update_booking_heatmap(filter_state):
+    return trace_patch(_booking_heatmap_figure(MARKETING_BOOKING, *filter_state_args(filter_state)))
+
+
+# Demographic button views, in the order of the buttons' callback arguments
+DEMOGRAPHIC_VIEWS = ['gender', 'age', 'course', 'region', 'age-course']
+
+# Show the figure of the most recently clicked button (gender until one is clicked).
+# Arguments: the figures store, the buttons' n_clicks, then their n_clicks_timestamp.
+SHOW_DEMOGRAPHIC_VIEW = """
+function(figures, ...buttons) {
+    if (!figures) {
+        return window.dash_clientside.no_update;
+    }
+    const views = %s;
+    const timestamps = buttons.slice(views.length);
+    const latest = timestamps.reduce((best, ts, i) => (ts > timestamps[best] ? i : best), 0);
+    return figures[views[latest]];
+}
+""" % json.dumps(DEMOGRAPHIC_VIEWS)
+
+# Demographics figures are memoized per button view and filter combination
+@cache.memoize()
+def _demographics_figure(view, start_date, end_date, age_range, course_types, cities):
+    """Demographics chart for one button view (see DEMOGRAPHIC_VIEWS)"""
+    # Initialize empty figure
+    fig = go.Figure()
+
+    filtered_df = _filter_demographics(start_date, end_date, age_range, course_types, cities)
+
+    # Check if filtered data is empty
+    if len(filtered_df) == 0:
+        fig.add_annotation(
+            text="No data available for the selected filters",
+            xref="paper",
+            yref="paper",
+            x=0.5,
+            y=0.5,
+            showarrow=False,
+            font=dict(size=28, color=COLOR_SCHEME['text'])
+        )
+        return fig.to_plotly_json()
+
+    # Create visualizations based on the selected view
+    if view == 'gender':
+        gender_dist = filtered_df['Gender'].value_counts()
+        gender_dist = gender_dist[gender_dist > 0]
+        colors = [COLOR_SCHEME['secondary'], COLOR_SCHEME['accent']]
+        fig = go.Figure(data=[go.Pie(
+            labels=gender_dist.index,
+            values=gender_dist.values,
+            hole=0.3,
+            textinfo='label+percent',
+            textposition='outside',
+            marker_colors=colors
+        )])
+        fig.update_layout(
+            title=dict(
+                text='Gender Distribution by Selected Region',
+                y=0.95,
+                x=0.5,
+                xanchor='center',
+                yanchor='top'
+            ),
+            title_font_size=24,
+            legend=dict(
+                font=dict(size=20)
+            ),
+            uniformtext=dict(
+                mode='hide',
+                minsize=18
+            )
+        )
+
+    elif view == 'age':
+        fig = go.Figure(data=[go.Histogram(
+            x=filtered_df['Age'],
+            nbinsx=20,
+            name='Age Distribution',
+            marker_color=COLOR_SCHEME['secondary']
+        )])
+        fig.update_layout(
+            title='Age Distribution by Selected Region',
+            xaxis_title='Age',
+            yaxis_title='Count'
+        )
+
+    elif view == 'course':
+        course_dist = filtered_df['Course_Type_Name'].value_counts()
+        course_dist = course_dist[course_dist > 0]
+        fig = go.Figure(data=[go.Bar(
+            x=course_dist.index,
+            y=course_dist.values,
+            text=course_dist.values,
+            textposition='auto',
+            marker_color=COLOR_SCHEME['secondary'],
+            name='Course Distribution',
+            hovertemplate="Course: %{x}<br>Count: %{y}<extra></extra>"
+        )])
+        fig.update_layout(
+            title='Course Type Distribution by Selected Region',
+            xaxis_title='Course Type',
+            yaxis_title='Count',
+            xaxis={'tickangle': 45},
+            #showlegend=False
+        )
+
+    elif view == 'region':
+        # Get region distribution for bars
+        region_dist = filtered_df['Learning Area'].value_counts().sort_values(ascending=False)
+        region_dist = region_dist[region_dist > 0]
+        n_regions = len(region_dist)
+        
+        # Get unique cities for legend
+        cities = filtered_df['City'].unique()
+        n_cities = len(cities)
+        
+        # Generate colors
+        colors = px.colors.sequential.Oranges[2:]
+        region_colors = colors[:n_regions] if n_regions <= len(colors) else colors * (n_regions // len(colors) + 1)
+        
+        # Create the bar chart with regions
+        fig = go.Figure(data=[go.Bar(
+            x=region_dist.index,
+            y=region_dist.values,
+            text=region_dist.values,
+            textposition='auto',
+            marker_color=region_colors,
+            showlegend=False,  # Hide the region legend
+            hovertemplate="Region: %{x}<br>Count: %{y}<extra></extra>"
+        )])
+        
+        # Add invisible scatter traces for city legend (in one batch)
+        fig.add_traces([
+            go.Scatter(
+                x=[None],
+                y=[None],
+                mode='markers',
+                marker=dict(color=region_colors[idx]),
+                name=city,
+                showlegend=True
+            )
+            for idx, city in enumerate(cities)
+        ])
+        
+        fig.update_layout(
+            title='Region Distribution (Sorted by Count)',
+            xaxis_title='Region',
+            yaxis_title='Count',
+            xaxis={'tickangle': 45},
+            showlegend=True,
+            legend=dict(
+                font=dict(
+                    family='"Segoe UI", Arial, sans-serif',
+                    size=28,  # 增加圖例字體大小
+                    color=COLOR_SCHEME['text']
+                ),
+                orientation="h",
+                yanchor="bottom",
+                y=1.02,
+                xanchor="right",
+                x=1
+            )
+        )
+
+    elif view == 'age-course':
+        # Create age-course distribution
+        age_course_dist = filtered_df.groupby(['Age', 'Course_Type_Name'], observed=True).size().unstack(fill_value=0)
+        
+        # One stacked area trace per course, handed to the figure in a single call
+        ages = age_course_dist.index.values
+        fig = go.Figure(data=[
+            go.Scatter(
+                x=ages,
+                y=counts,
+                name=course,
+                mode='lines',
+                stackgroup='one',
+                line=dict(width=0.5),
+                hovertemplate=(
+                    "Age: %{x}<br>" +
+                    "Count: %{y}<br>" +
+                    "<extra></extra>"
+                )
+            )
+            for course, counts in zip(age_course_dist.columns, age_course_dist.values.T)
+        ])
+        
+        fig.update_layout(
+            title='Age Distribution by Course Type in Selected Region',
+            xaxis_title='Age',
+            yaxis_title='Count',
+            hovermode='x unified'
+        )
+
+    # Apply common styling
+    fig.update_layout(
+        plot_bgcolor='white',
+        paper_bgcolor='white',
+        font=dict(color=COLOR_SCHEME['text']),
+        title_x=0.5,
+        title_font=dict(size=24),
+        showlegend=True,
+        legend=dict(
+            orientation="h",
+            yanchor="bottom",
+            y=1.02,
+            xanchor="right",
+            x=1
+        )
+    )
+
+    return fig.to_plotly_json()
+
+# Demographics figures for every button view; the buttons switch between them clientside
+@app.callback(
+    Output('demographics-figures', 'data'),
+    Input('filter-state', 'data'),
+    prevent_initial_call=False
+)
+def update_demographics(filter_state):
+    start_date, end_date, age_range, course_types, cities, _ = filter_state_args(filter_state)
+    return {view: _demographics_figure(view, start_date, end_date, age_range, course_types, cities)
+            for view in DEMOGRAPHIC_VIEWS}
+
+app.clientside_callback(
+    SHOW_DEMOGRAPHIC_VIEW,
+    Output('demographics-chart', 'figure'),
+    Input('demographics-figures', 'data'),
+    [Input(f'btn-{view}', 'n_clicks') for view in DEMOGRAPHIC_VIEWS],
+    [State(f'btn-{view}', 'n_clicks_timestamp') for view in DEMOGRAPHIC_VIEWS]
+)
+
+# Demographics figures for every button view; the buttons switch between them clientside
+@app.callback(
+    Output('marketing-demographics-figures', 'data'),
+    Input('filter-state', 'data'),
+    prevent_initial_call=False
+)
+def update_demographics(filter_state):
+    start_date, end_date, age_range, course_types, cities, _ = filter_state_args(filter_state)
+    return {view: _demographics_figure(view, start_date, end_date, age_range, course_types, cities)
+            for view in DEMOGRAPHIC_VIEWS}
+
+app.clientside_callback(
+    SHOW_DEMOGRAPHIC_VIEW,
+    Output('marketing-demographics-chart', 'figure'),
+    Input('marketing-demographics-figures', 'data'),
+    [Input(f'marketing-btn-{view}', 'n_clicks') for view in DEMOGRAPHIC_VIEWS],
+    [State(f'marketing-btn-{view}', 'n_clicks_timestamp') for view in DEMOGRAPHIC_VIEWS]
+)
+
+
+# Teacher Class Trend Chart
+@app.callback(
+    Output('teacher-class-trend', 'figure'),
+    Input('filter-state', 'data'),
+    prevent_initial_call=False
+)
+def update_teacher_trend(filter_state):
+    start_date, end_date, age_range, _, cities, genders = filter_state_args(filter_state)
+    return _teacher_trend_figure(start_date, end_date, age_range, cities, genders)
+
+# Teacher Class Trend Chart
+@app.callback(
+    Output('operation-teacher-class-trend', 'figure'),
+    Input('filter-state', 'data'),
+    prevent_initial_call=False
+)
+def update_teacher_trend(filter_state):
+    start_date, end_date, age_range, _, cities, genders = filter_state_args(filter_state)
+    return _teacher_trend_figure(start_date, end_date, age_range, cities, genders)
+
+
+# Teacher Student Distribution Heatmap
+@app.callback(
+    Output('teacher-student-heatmap', 'figure'),
+    Input('filter-state', 'data'),
+    prevent_initial_call=False
+)
+    
+def update_teacher_trend(filter_state):
+    start_date, end_date, age_range, _, cities, genders = filter_state_args(filter_state)
+    return _teacher_heatmap_figure(start_date, end_date, age_range, cities, genders)
+
+@app.callback(
+    Output('marketing-teacher-student-heatmap', 'figure'),
+    Input('filter-state', 'data'),
+    prevent_initial_call=False
+)
+    
+def update_teacher_trend(filter_state):
+    start_date, end_date, age_range, _, cities, genders = filter_state_args(filter_state)
+    return _teacher_heatmap_figure(start_date, end_date, age_range, cities, genders)
 
 
 if __name__ == '__main__':